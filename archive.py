@@ -0,0 +1,95 @@
+"""Archive of completed deliveries for Parcel Package Tracking."""
+from datetime import timedelta
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import ARCHIVE_SAVE_DELAY, HISTORY_RETENTION_DAYS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeliveryArchive:
+    """Completed deliveries that were moved out of the live entity set.
+
+    Each delivery is kept as a compact [carrier, description, completed,
+    archived] list; the full event timeline stays in the EventHistory.
+    """
+
+    def __init__(self, store: Store):
+        """Initialize the archive."""
+        self._store = store
+        # tracking number -> [carrier code, description, completed iso, archived iso]
+        self._deliveries = {}
+
+    async def async_load(self) -> None:
+        """Load the archive from disk."""
+        stored = await self._store.async_load()
+        if stored:
+            self._deliveries = stored["deliveries"]
+
+    def __contains__(self, tracking_number: str) -> bool:
+        """Return True if the delivery is archived."""
+        return tracking_number in self._deliveries
+
+    def __len__(self) -> int:
+        """Return the number of archived deliveries."""
+        return len(self._deliveries)
+
+    def __iter__(self):
+        """Iterate over the archived tracking numbers."""
+        return iter(self._deliveries)
+
+    @callback
+    def async_add(self, deliveries, completed_since: dict, now) -> None:
+        """Archive the given deliveries, dropping entries past retention."""
+        archived = now.isoformat()
+        for delivery in deliveries:
+            self._deliveries[delivery.tracking_number] = [
+                delivery.carrier_code,
+                delivery.description,
+                completed_since[delivery.tracking_number].isoformat(),
+                archived,
+            ]
+
+        cutoff = (now - timedelta(days=HISTORY_RETENTION_DAYS)).isoformat()
+        expired = [
+            tracking_number
+            for tracking_number, (_, _, _, archived_at) in self._deliveries.items()
+            if archived_at < cutoff
+        ]
+        for tracking_number in expired:
+            del self._deliveries[tracking_number]
+
+        _LOGGER.debug(
+            "Archived %d deliveries, dropped %d past retention",
+            len(deliveries),
+            len(expired),
+        )
+        self._store.async_delay_save(self._data_to_save, ARCHIVE_SAVE_DELAY)
+
+    @callback
+    def async_discard(self, tracking_number: str) -> None:
+        """Take a delivery out of the archive, e.g. when it becomes active again."""
+        if self._deliveries.pop(tracking_number, None) is not None:
+            self._store.async_delay_save(self._data_to_save, ARCHIVE_SAVE_DELAY)
+
+    def get(self, tracking_number: str):
+        """Return an archived delivery as a dict, or None."""
+        entry = self._deliveries.get(tracking_number)
+        if entry is None:
+            return None
+        carrier_code, description, completed, archived = entry
+        return {
+            "tracking_number": tracking_number,
+            "carrier_code": carrier_code,
+            "description": description,
+            "completed": completed,
+            "archived": archived,
+        }
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the archive to persist."""
+        return {"deliveries": self._deliveries}
@@ -0,0 +1,87 @@
+"""Measure the resident size of deliveries as raw dicts and as Delivery objects.
+
+Run from the repository root:
+
+    python benchmarks/bench_model_memory.py --packages 1000 --events 20
+
+Prints a JSON document with the bytes allocated per 1,000 packages for the
+decoded JSON dicts, for the parsed model, and for a second parse of the same
+payload that shares its events with the first one.
+"""
+import argparse
+import gc
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from payload import make_response  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_model():
+    """Import model.py from the repository root without Home Assistant."""
+    spec = importlib.util.spec_from_file_location("parcel_model", ROOT / "model.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(build):
+    """Return the object built by build and the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    model = load_model()
+    body = json.dumps(make_response(args.packages, args.events)).encode()
+
+    _, raw_bytes = measure(lambda: json.loads(body)["deliveries"])
+
+    def parse(previous=None):
+        previous = previous or {}
+        return {
+            delivery["tracking_number"]: model.Delivery.from_dict(
+                delivery, previous.get(delivery["tracking_number"])
+            )
+            for delivery in json.loads(body)["deliveries"]
+        }
+
+    parsed, parsed_bytes = measure(parse)
+    _, reparsed_bytes = measure(lambda: parse(parsed))
+
+    scale = 1000 / args.packages
+    print(
+        json.dumps(
+            {
+                "packages": args.packages,
+                "events_per_package": args.events,
+                "bytes_per_1000_packages": {
+                    "raw_dicts": round(raw_bytes * scale),
+                    "model": round(parsed_bytes * scale),
+                    "model_reparse_shared": round(reparsed_bytes * scale),
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""End-to-end refresh benchmark for both Parcel integrations.
+
+Starts a local fake Parcel API and a minimal in-process Home Assistant, sets
+up the integration against it and measures, per refresh:
+
+* end-to-end refresh latency
+* time spent notifying entities
+* number of entity state writes and state changes
+* peak memory allocated during the refresh (with --memory, since tracing
+  memory slows the refresh down)
+
+Requires Home Assistant to be installed. Run from the repository root:
+
+    python benchmarks/bench_refresh.py --integration root --packages 500
+    python benchmarks/bench_refresh.py --integration custom --changed 0.05
+
+Results are printed as JSON, or written to --output.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_api import FakeParcelAPI  # noqa: E402
+from payload import make_deliveries, mutate, parse_status_mix  # noqa: E402
+
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    issue_registry as ir,
+    restore_state as rs,
+    translation,
+)
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _link_integration(config_dir, integration):
+    """Expose the chosen integration as custom_components/parcel."""
+    target = Path(config_dir, "custom_components", "parcel")
+    target.parent.mkdir()
+    Path(target.parent, "__init__.py").touch()
+
+    if integration == "custom":
+        target.symlink_to(ROOT / "custom_components" / "parcel")
+        return
+
+    # The root integration keeps its package init in init.py
+    target.mkdir()
+    for path in ROOT.iterdir():
+        if path.suffix in (".py", ".json") and path.name != "init.py":
+            Path(target, path.name).symlink_to(path)
+    Path(target, "__init__.py").symlink_to(ROOT / "init.py")
+
+
+async def _async_start_hass(config_dir):
+    """Start the parts of Home Assistant needed to run the integration."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config.set_time_zone("UTC")
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    translation.async_setup(hass)
+    await asyncio.gather(
+        ar.async_load(hass),
+        dr.async_load(hass),
+        er.async_load(hass),
+        ir.async_load(hass),
+        rs.async_load(hass),
+    )
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+    assert await async_setup_component(hass, "sensor", {})
+    # Push is never enabled here, so the webhook dependency and the HTTP
+    # server behind it are marked as set up instead of being started
+    hass.config.components.add("webhook")
+    return hass
+
+
+class WriteCounter:
+    """Count entity state writes."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.writes = 0
+        self._original = entity.Entity.async_write_ha_state
+
+    def __enter__(self):
+        """Start counting."""
+        counter = self
+        original = self._original
+
+        def async_write_ha_state(self):
+            counter.writes += 1
+            original(self)
+
+        entity.Entity.async_write_ha_state = async_write_ha_state
+        return self
+
+    def __exit__(self, *exc):
+        """Stop counting."""
+        entity.Entity.async_write_ha_state = self._original
+
+
+async def _async_run(args):
+    """Run the benchmark and return the results."""
+    rng = random.Random(args.seed)
+    deliveries = make_deliveries(
+        args.packages, args.events, args.seed, args.status_mix
+    )
+    api = FakeParcelAPI(
+        deliveries,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    endpoint = await api.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        _link_integration(config_dir, args.integration)
+        sys.path.insert(0, config_dir)
+        hass = await _async_start_hass(config_dir)
+
+        # Point the integration at the fake API
+        component = importlib.import_module("custom_components.parcel")
+        component.API_ENDPOINT = endpoint
+        if args.integration == "root":
+            importlib.import_module("custom_components.parcel.hub").API_ENDPOINT = (
+                endpoint
+            )
+
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain="parcel",
+            title="Parcel",
+            data={"api_key": "benchmark", "name": "Parcel"},
+            source=config_entries.SOURCE_USER,
+            options={},
+        )
+        await hass.config_entries.async_add(entry)
+
+        start = time.perf_counter()
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - start
+        coordinator = hass.data["parcel"][entry.entry_id]
+        if hasattr(coordinator, "scheduler"):
+            # Measure the refresh path, not the quota guard
+            coordinator.scheduler.limit = 1_000_000
+
+        state_changes = 0
+
+        def _count_state_change(event):
+            nonlocal state_changes
+            state_changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_change)
+
+        notify_time = 0.0
+        update_listeners = coordinator.async_update_listeners
+
+        def _timed_update_listeners():
+            nonlocal notify_time
+            notify_start = time.perf_counter()
+            update_listeners()
+            notify_time += time.perf_counter() - notify_start
+
+        coordinator.async_update_listeners = _timed_update_listeners
+
+        refreshes = []
+        for _ in range(args.refreshes):
+            changed = len(mutate(deliveries, args.changed, rng))
+            api.invalidate()
+            state_changes = 0
+            notify_time = 0.0
+
+            peak = None
+            with WriteCounter() as counter:
+                if args.memory:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                await hass.async_block_till_done()
+                elapsed = time.perf_counter() - start
+                if args.memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+            refreshes.append(
+                {
+                    "changed_packages": changed,
+                    "success": coordinator.last_update_success,
+                    "latency": elapsed,
+                    "entity_update_time": notify_time,
+                    "state_writes": counter.writes,
+                    "state_changes": state_changes,
+                    "peak_memory": peak,
+                }
+            )
+
+        entities = len(hass.states.async_entity_ids("sensor"))
+        await hass.async_stop()
+        sys.path.remove(config_dir)
+
+    await api.stop()
+
+    def _median(key):
+        values = [refresh[key] for refresh in refreshes if refresh[key] is not None]
+        return statistics.median(values) if values else None
+
+    return {
+        "integration": args.integration,
+        "packages": args.packages,
+        "events_per_package": args.events,
+        "changed_fraction": args.changed,
+        "latency_injected": args.latency,
+        "entities": entities,
+        "setup_time": setup_time,
+        "api_requests": api.requests,
+        "api_responses": api.responses,
+        "median": {
+            "latency": _median("latency"),
+            "entity_update_time": _median("entity_update_time"),
+            "state_writes": _median("state_writes"),
+            "state_changes": _median("state_changes"),
+            "peak_memory": _median("peak_memory"),
+        },
+        "refreshes": refreshes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parcel refresh benchmark")
+    parser.add_argument("--integration", choices=("root", "custom"), default="root")
+    parser.add_argument("--packages", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--status-mix", type=parse_status_mix, default=None)
+    parser.add_argument(
+        "--changed", type=float, default=0.05, help="fraction changed per refresh"
+    )
+    parser.add_argument("--refreshes", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--memory", action="store_true", help="trace peak memory per refresh"
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(_async_run(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + os.linesep)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Microbenchmark of the per-write cost of the custom integration's sensors.
+
+Every state write makes Home Assistant read the sensor's state, icon and
+attributes. This measures those reads for a set of delivery sensors, and the
+per-update cost of preparing them when the coordinator delivers new data.
+
+Requires Home Assistant to be installed. Run from the repository root:
+
+    python benchmarks/bench_sensor_write.py --packages 500 --rounds 20
+"""
+import argparse
+import importlib
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from payload import make_deliveries  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+# Appended, so the root integration's calendar.py can't shadow the stdlib module
+sys.path.append(str(ROOT))
+
+
+def _read_state(sensor):
+    """Read what a state write reads from the sensor."""
+    return sensor.state, sensor.icon, sensor.extra_state_attributes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    component = importlib.import_module("custom_components.parcel")
+    sensor_module = importlib.import_module("custom_components.parcel.sensor")
+
+    deliveries = make_deliveries(args.packages, args.events, args.seed)
+    rng = random.Random(args.seed)
+    for delivery in deliveries:
+        if rng.random() < 0.5:
+            delivery["timestamp_expected"] = 1_700_000_000 + rng.randrange(10**6)
+    coordinator = SimpleNamespace(
+        data=component._build_data(deliveries, []),
+        stale=False,
+    )
+    sensors = [
+        sensor_module.ParcelDeliverySensor(coordinator, delivery, "active")
+        for delivery in deliveries
+    ]
+
+    # Work done once per coordinator update, if the sensor caches its values
+    update = getattr(sensor_module.ParcelDeliverySensor, "_update_from_delivery", None)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for sensor in sensors:
+            if update is not None:
+                update(sensor)
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for sensor in sensors:
+            _read_state(sensor)
+    write_time = time.perf_counter() - start
+
+    calls = args.rounds * len(sensors)
+    print(
+        json.dumps(
+            {
+                "packages": args.packages,
+                "events_per_package": args.events,
+                "rounds": args.rounds,
+                "cached": update is not None,
+                "us_per_update": round(update_time / calls * 1e6, 3),
+                "us_per_write": round(write_time / calls * 1e6, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Local stand-in for the Parcel deliveries API.
+
+Serves ``/external/deliveries/`` like ``API_ENDPOINT`` does, from deliveries
+held in memory, with adjustable latency, error rate and rate limiting. Can be
+used from the benchmarks or run on its own:
+
+    python benchmarks/fake_api.py --packages 500 --events 20 --port 8765
+
+It can also stand in for a push sender, posting the deliveries that changed
+to the integration's webhook (shown in the log when push mode is enabled):
+
+    python benchmarks/fake_api.py --push-to http://localhost:8123/api/webhook/ID
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from pathlib import Path
+import sys
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from payload import make_deliveries, mutate, parse_status_mix  # noqa: E402
+
+PATH = "/external/deliveries/"
+
+
+class FakeParcelAPI:
+    """In-memory Parcel API with configurable misbehaviour."""
+
+    def __init__(
+        self,
+        deliveries,
+        latency=0.0,
+        error_rate=0.0,
+        rate_limit=None,
+        retry_after=60,
+        seed=0,
+    ):
+        """Initialize the fake API."""
+        self.deliveries = deliveries
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.requests = 0
+        self.responses = {}
+        self._rng = random.Random(seed)
+        self._body = None
+
+    def invalidate(self):
+        """Drop the cached response body after the deliveries changed."""
+        self._body = None
+
+    def _active(self):
+        """Return the deliveries that are not completed."""
+        return [d for d in self.deliveries if d.get("status_code") != 0]
+
+    def _render(self, filter_mode):
+        """Return the response body and its ETag for a filter mode."""
+        if filter_mode == "active":
+            deliveries = self._active()
+        else:
+            deliveries = self.deliveries
+        body = json.dumps({"success": True, "deliveries": deliveries}).encode()
+        return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def _count(self, status):
+        """Count a response by status code."""
+        self.responses[status] = self.responses.get(status, 0) + 1
+
+    async def handle(self, request):
+        """Handle a deliveries request."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if not request.headers.get("api-key"):
+            self._count(401)
+            return web.json_response(
+                {"success": False, "error_message": "Missing API key"}, status=401
+            )
+
+        if self.rate_limit is not None and self.requests > self.rate_limit:
+            self._count(429)
+            return web.json_response(
+                {"success": False, "error_message": "Rate limit exceeded"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self._count(500)
+            return web.Response(status=500, text="Internal Server Error")
+
+        body, etag = self._render(request.query.get("filter_mode", "recent"))
+        if request.headers.get("If-None-Match") == etag:
+            self._count(304)
+            return web.Response(status=304, headers={"ETag": etag})
+
+        self._count(200)
+        response = web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+        response.enable_compression()
+        return response
+
+    def app(self):
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get(PATH, self.handle)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start serving and return the endpoint URL."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}{PATH}"
+
+    async def stop(self):
+        """Stop serving."""
+        await self._runner.cleanup()
+
+    async def push(self, url, deliveries=None):
+        """Post deliveries to a push webhook, all of them by default.
+
+        Returns the HTTP status of the webhook's response.
+        """
+        if deliveries is None:
+            deliveries = self.deliveries
+        async with ClientSession() as session:
+            async with session.post(
+                url, json={"success": True, "deliveries": deliveries}
+            ) as response:
+                return response.status
+
+
+async def _serve(args):
+    """Run the fake API until interrupted."""
+    api = FakeParcelAPI(
+        make_deliveries(args.packages, args.events, status_mix=args.status_mix),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+    )
+    print(await api.start(port=args.port), flush=True)
+
+    if not args.push_to:
+        await asyncio.Event().wait()
+
+    # Change some deliveries now and then and push them like Parcel would
+    rng = random.Random()
+    while True:
+        changed = mutate(api.deliveries, args.changed, rng)
+        api.invalidate()
+        status = await api.push(args.push_to, changed)
+        print(f"pushed {len(changed)} deliveries: HTTP {status}", flush=True)
+        await asyncio.sleep(args.push_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Parcel API")
+    parser.add_argument("--packages", type=int, default=100)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--status-mix", type=parse_status_mix, default=None)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--push-to", help="webhook URL to push changes to")
+    parser.add_argument(
+        "--push-interval", type=float, default=30.0, help="seconds between pushes"
+    )
+    parser.add_argument(
+        "--changed", type=float, default=0.05, help="fraction changed per push"
+    )
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Synthetic Parcel API payloads for the benchmarks."""
+import random
+
+CARRIERS = ["usps", "fedex", "ups", "dhl", "amzlus", "canadapost", "royalmail"]
+LOCATIONS = [f"{city}, {state}" for city, state in (
+    ("Memphis", "TN"), ("Louisville", "KY"), ("Indianapolis", "IN"),
+    ("Ontario", "CA"), ("Newark", "NJ"), ("Dallas", "TX"), ("Chicago", "IL"),
+)]
+EVENTS = [
+    "Shipment information received",
+    "Picked up",
+    "Arrived at facility",
+    "Departed facility",
+    "In transit",
+    "Out for delivery",
+    "Delivered",
+]
+
+# Rough status mix of a real account: mostly in transit or already delivered
+DEFAULT_STATUS_MIX = {0: 40, 1: 2, 2: 35, 3: 3, 4: 8, 5: 2, 6: 2, 7: 2, 8: 6}
+
+
+def parse_status_mix(value):
+    """Parse a status mix like "0:40,2:35,4:8" into a dict."""
+    mix = {}
+    for item in value.split(","):
+        status, weight = item.split(":")
+        mix[int(status)] = float(weight)
+    return mix
+
+
+def make_delivery(index, events, rng, status_mix=None):
+    """Return a single delivery as decoded from the API."""
+    status_mix = status_mix or DEFAULT_STATUS_MIX
+    status = rng.choices(list(status_mix), weights=list(status_mix.values()))[0]
+    return {
+        "tracking_number": f"1Z{index:016d}",
+        "carrier_code": rng.choice(CARRIERS),
+        "description": f"Order {index}",
+        "status_code": status,
+        "date_expected": f"2024-01-{1 + index % 28:02d} 18:00",
+        "timestamp_expected": 1704067200 + index % 28 * 86400 + 64800,
+        "events": [
+            {
+                "event": rng.choice(EVENTS),
+                "date": f"2024-01-{1 + (event // 24) % 28:02d} {event % 24:02d}:00",
+                "location": rng.choice(LOCATIONS),
+            }
+            for event in range(events, 0, -1)
+        ],
+    }
+
+
+def make_deliveries(packages, events, seed=0, status_mix=None):
+    """Return a list of deliveries as decoded from the API."""
+    rng = random.Random(seed)
+    return [make_delivery(index, events, rng, status_mix) for index in range(packages)]
+
+
+def make_response(packages, events, seed=0, status_mix=None):
+    """Return a full deliveries response body as decoded from the API."""
+    return {
+        "success": True,
+        "deliveries": make_deliveries(packages, events, seed, status_mix),
+    }
+
+
+def mutate(deliveries, fraction, rng):
+    """Append a new event to a random fraction of the deliveries, in place.
+
+    Returns the deliveries that changed.
+    """
+    count = round(len(deliveries) * fraction)
+    changed = rng.sample(deliveries, count)
+    for delivery in changed:
+        delivery["events"].insert(
+            0,
+            {
+                "event": rng.choice(EVENTS),
+                "date": f"2024-02-01 {len(delivery['events']) % 24:02d}:00",
+                "location": rng.choice(LOCATIONS),
+            },
+        )
+    return changed
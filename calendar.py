@@ -0,0 +1,105 @@
+"""Calendar platform for Parcel Package Tracking."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CARRIER_NAMES,
+    COMPLETED_STATUS_CODE,
+    DELIVERY_EVENT_DURATION,
+    STATUS_CODES,
+)
+from .entity import ParcelEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# An event can end this long after the window in the index, as all-day events
+# last until the end of their day and timed events get a default duration
+_LOOKBACK = timedelta(days=1)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the Parcel deliveries calendar based on a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([ParcelCalendar(coordinator, entry)])
+
+
+def _calendar_event(package) -> CalendarEvent:
+    """Return the calendar event of a package's expected delivery window."""
+    carrier_name = CARRIER_NAMES.get(package.carrier_code, package.carrier_code)
+    if package.timestamp_expected is None and len(package.date_expected or "") <= 10:
+        # Only a date is known, so the delivery is an all-day event
+        start = package.expected.date()
+        end = (package.expected_end or package.expected).date() + timedelta(days=1)
+    else:
+        start = package.expected
+        end = package.expected_end
+        if end is None or end <= start:
+            end = start + timedelta(minutes=DELIVERY_EVENT_DURATION)
+
+    location = package.events[0].location if package.events else None
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=f"{package.description} ({carrier_name})",
+        description=STATUS_CODES.get(package.status_code, "Unknown"),
+        location=location or None,
+        uid=package.tracking_number,
+    )
+
+
+class ParcelCalendar(ParcelEntity, CalendarEntity):
+    """Expected deliveries of all packages on a calendar.
+
+    Events come from the coordinator's sorted index of expected times, so a
+    range query bisects to the range instead of scanning every package.
+    """
+
+    def __init__(self, coordinator, entry):
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"parcel_{entry.entry_id}_deliveries"
+        self._attr_name = "Parcel Deliveries"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next expected delivery that is not completed."""
+        coordinator = self.coordinator
+        now = dt_util.now()
+        for tracking_number in coordinator.index.expected_between(
+            now - coordinator.index.longest_window - _LOOKBACK
+        ):
+            package = coordinator.packages[tracking_number]
+            if package.status_code == COMPLETED_STATUS_CODE:
+                continue
+            event = _calendar_event(package)
+            if event.end_datetime_local > now:
+                return event
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the expected deliveries between the given times."""
+        coordinator = self.coordinator
+        events = []
+        for tracking_number in coordinator.index.overlapping(
+            start_date - _LOOKBACK, end_date
+        ):
+            event = _calendar_event(coordinator.packages[tracking_number])
+            if (
+                event.end_datetime_local > start_date
+                and event.start_datetime_local < end_date
+            ):
+                events.append(event)
+        return events
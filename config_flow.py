@@ -4,6 +4,7 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.const import CONF_NAME
@@ -18,6 +19,7 @@ from .const import (
     DEFAULT_FILTER_MODE,
     DEFAULT_SCAN_INTERVAL,
 )
+from .options_flow import ParcelOptionsFlowHandler, entry_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,7 +27,13 @@ _LOGGER = logging.getLogger(__name__)
 class ParcelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Parcel Package Tracking."""
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow for a config entry."""
+        return ParcelOptionsFlowHandler(config_entry)
     
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
@@ -39,9 +47,12 @@ class ParcelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
             if valid:
-                # Create a unique ID based on the API key (first 8 chars)
-                # This avoids exposing the full key while allowing multiple accounts
-                unique_id = user_input[CONF_API_KEY][:8]
+                # One entry per account and filter mode; entries of the same
+                # account share a single fetcher
+                unique_id = entry_unique_id(
+                    user_input[CONF_API_KEY],
+                    user_input.get(CONF_FILTER_MODE, DEFAULT_FILTER_MODE),
+                )
                 await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
 
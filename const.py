@@ -1,17 +1,53 @@
 """Constants for the Parcel Package Tracking integration."""
 
 DOMAIN = "parcel"
+DATA_HUBS = f"{DOMAIN}_hubs"
 
 # Configuration constants
 CONF_API_KEY = "api_key"
 CONF_FILTER_MODE = "filter_mode"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_EVENT_LIMIT = "event_limit"
+CONF_SUMMARY_ONLY = "summary_only"
+CONF_ARCHIVE_DAYS = "archive_days"
+CONF_PUSH = "push"
 
 # API constants
 API_ENDPOINT = "https://api.parcel.app/external/deliveries/"
 DEFAULT_FILTER_MODE = "active"
 FILTER_MODES = ["active", "recent"]
 DEFAULT_SCAN_INTERVAL = 30  # 30 minutes to respect 20 requests/hour limit
+DEFAULT_EVENT_LIMIT = 5  # latest events kept in sensor attributes
+DEFAULT_SUMMARY_ONLY = False  # only create the aggregate sensors
+DEFAULT_ARCHIVE_DAYS = 14  # days a completed package stays live, 0 keeps it
+DEFAULT_PUSH = False  # accept delivery updates on a webhook
+DECODE_EXECUTOR_THRESHOLD = 256 * 1024  # bytes, larger payloads decode off the loop
+HUB_SHARE_WINDOW = 60  # seconds a fetch result is shared with other entries
+REFRESH_PARALLELISM = 4  # coordinators the refresh service updates at once
+BACKOFF_BASE = 60  # seconds before the first retry after a failure
+BACKOFF_MAX = 3600  # seconds, upper bound of the retry delay
+BREAKER_THRESHOLD = 5  # consecutive failures before requests are suspended
+METRICS_WINDOW = 50  # refreshes kept for the rolling p50/p95 metrics
+SEARCH_LIMIT = 50  # default number of deliveries parcel.search returns
+DELIVERY_EVENT_DURATION = 60  # minutes, calendar events without an expected end
+
+# Rate limit and adaptive polling
+API_RATE_LIMIT = 20  # requests per period
+API_RATE_PERIOD = 3600  # seconds
+MANUAL_REFRESH_RESERVE = 2  # requests kept back for manual refreshes
+URGENT_SCAN_INTERVAL = 5  # minutes, used while a package is close to delivery
+IDLE_SCAN_INTERVAL = 120  # minutes, used when no package is moving
+PUSH_SCAN_INTERVAL = 180  # minutes, safety-net polling while push is enabled
+URGENT_STATUS_CODES = {4, 6}  # Out for Delivery, Delivery Attempt Failed
+IDLE_STATUS_CODES = {0, 1}  # Completed, Frozen
+
+# Storage
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds, coalesces writes after a refresh
+HISTORY_SAVE_DELAY = 60  # seconds
+HISTORY_COMPACT_INTERVAL = 24  # hours between compactions
+HISTORY_RETENTION_DAYS = 365  # keep timelines this long after leaving the feed
+ARCHIVE_SAVE_DELAY = 60  # seconds
 
 # Status code to text mapping
 STATUS_CODES = {
@@ -42,6 +78,9 @@ CARRIER_NAMES = {
     # Add more as needed
 }
 
+COMPLETED_STATUS_CODE = 0
+OUT_FOR_DELIVERY_STATUS_CODE = 4
+
 # Icons for different status types
 STATUS_ICONS = {
     0: "mdi:package-variant-closed-check",  # Completed
@@ -65,3 +104,5 @@ ATTR_LATEST_EVENT = "latest_event"
 ATTR_LATEST_EVENT_LOCATION = "latest_event_location"
 ATTR_LATEST_EVENT_TIME = "latest_event_time"
 ATTR_EVENTS = "events"
+ATTR_EVENT_COUNT = "event_count"
+ATTR_STALE = "stale"
@@ -1,15 +1,33 @@
 """The Parcel integration."""
 import asyncio
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+import json
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-import requests
+from homeassistant.util import dt as dt_util
+import aiohttp
+from aiohttp import hdrs
 
-from .const import API_ENDPOINT, CONF_API_KEY, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    API_ENDPOINT,
+    API_TIMEOUT,
+    BACKOFF_BASE,
+    COMPLETED_STATUS_CODE,
+    CONF_API_KEY,
+    DATE_CACHE_SIZE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+    VERIFY_INTERVAL,
+)
+from .resilience import CircuitBreaker, CircuitOpen, RateLimited, parse_retry_after
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,9 +42,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Parcel from a config entry."""
     api_key = entry.data[CONF_API_KEY]
     
-    coordinator = ParcelDataUpdateCoordinator(hass, api_key)
+    coordinator = ParcelDataUpdateCoordinator(hass, api_key, entry.entry_id)
     
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last good snapshot when there is one so entities exist
+    # immediately and no API request is spent during startup
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        # A failed first refresh is retried by the coordinator with backoff
+        # instead of reloading the entry on HA's retry schedule
+        await coordinator.async_refresh()
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -36,6 +60,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass.config_entries.async_forward_entry_setup(entry, platform)
         )
     
+    if restored and coordinator.snapshot_is_stale:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} snapshot refresh"
+        )
+    
     return True
 
 
@@ -56,12 +85,37 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot when a config entry is deleted."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 class ParcelDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, hass, api_key):
+    def __init__(self, hass, api_key, entry_id):
         """Initialize."""
         self.api_key = api_key
+        # Last good data is kept on disk for quota-free startup
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self.snapshot_time = None
+        # HA's shared session keeps connections to the API alive between polls
+        self.session = async_get_clientsession(hass)
+        # Content fingerprints of the previous refresh, used to diff deliveries
+        self._fingerprints = {}
+        # Tracking numbers added, changed or removed by the last refresh
+        self.changed_deliveries = set()
+        self.change_counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        self._last_notified_success = True
+        # Backoff and circuit state of the API
+        self.breaker = CircuitBreaker()
+        # True while the last good data is served after failed refreshes
+        self.stale = False
+        self._last_notified_stale = False
+        # The active list is derived from the recent one, which spends one
+        # request per poll, until a verification fetch disagrees with it
+        self.derive_active = True
+        self._polls_until_verify = 0
         
         super().__init__(
             hass,
@@ -73,29 +127,272 @@ class ParcelDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Update data via API."""
         try:
-            return await self.hass.async_add_executor_job(self._get_data)
-        except requests.RequestException as error:
-            raise UpdateFailed(f"Error communicating with API: {error}") from error
-
-    def _get_data(self):
-        """Get data from the API."""
-        headers = {"api-key": self.api_key}
-        active_response = requests.get(
-            f"{API_ENDPOINT}?filter_mode=active", headers=headers, timeout=10
+            if not self.breaker.allow():
+                raise CircuitOpen(
+                    "Parcel API requests suspended for "
+                    f"{self.breaker.seconds_until_retry():.0f} seconds"
+                )
+            try:
+                data = await self._get_data()
+            except RateLimited as error:
+                self.breaker.record_failure(error.retry_after)
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                self.breaker.record_failure()
+                raise UpdateFailed(f"Error communicating with API: {error}") from error
+            except UpdateFailed:
+                self.breaker.record_failure()
+                raise
+            except Exception as error:
+                # A malformed response, e.g. invalid JSON or a delivery
+                # without a tracking number, is served stale like any failure
+                self.breaker.record_failure()
+                raise UpdateFailed(f"Unexpected error occurred: {error}") from error
+        except (CircuitOpen, UpdateFailed) as error:
+            return self._serve_stale(error)
+        
+        self.breaker.record_success()
+        self.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        self.stale = False
+        self._diff_deliveries(data["deliveries"])
+        self.snapshot_time = dt_util.utcnow()
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        return data
+
+    def _serve_stale(self, error):
+        """Serve the last good data after a failed refresh.
+        
+        The next attempt follows the breaker's backoff. Entities stay
+        available and are marked stale; without any data the error is raised.
+        """
+        self.update_interval = timedelta(
+            seconds=self.breaker.seconds_until_retry() or BACKOFF_BASE
         )
-        active_response.raise_for_status()
-        active_data = active_response.json()
+        if self.data is None:
+            raise UpdateFailed(str(error)) from error
+        
+        _LOGGER.warning("%s; serving last known data", error)
+        self.stale = True
+        self.changed_deliveries = set()
+        return self.data
+
+    async def async_restore_snapshot(self):
+        """Restore the last good data from disk.
         
-        recent_response = requests.get(
-            f"{API_ENDPOINT}?filter_mode=recent", headers=headers, timeout=10
+        Returns True when a snapshot was found and loaded.
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        
+        data = _build_data(snapshot["active"], snapshot["recent"])
+        self._diff_deliveries(data["deliveries"])
+        self.snapshot_time = dt_util.parse_datetime(snapshot["timestamp"])
+        self.data = data
+        _LOGGER.debug(
+            "Restored %d deliveries from snapshot taken at %s",
+            len(data["deliveries"]),
+            self.snapshot_time,
+        )
+        return True
+
+    @property
+    def snapshot_is_stale(self):
+        """Return True if the data is older than the scan interval."""
+        if self.snapshot_time is None:
+            return True
+        return dt_util.utcnow() - self.snapshot_time >= self.update_interval
+
+    @callback
+    def _snapshot(self):
+        """Return the data to persist."""
+        return {
+            "timestamp": self.snapshot_time.isoformat(),
+            "active": self.data["active"],
+            "recent": self.data["recent"],
+        }
+
+    def _diff_deliveries(self, deliveries):
+        """Compare the merged deliveries against the previous refresh."""
+        previous = self._fingerprints
+        current = {
+            tracking_number: _fingerprint(delivery)
+            for tracking_number, delivery in deliveries.items()
+        }
+        
+        added = current.keys() - previous.keys()
+        removed = previous.keys() - current.keys()
+        changed = {
+            tracking_number
+            for tracking_number, fingerprint in current.items()
+            if tracking_number in previous and previous[tracking_number] != fingerprint
+        }
+        
+        self._fingerprints = current
+        self.changed_deliveries = added | changed | removed
+        self.change_counts = {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": len(current) - len(added) - len(changed),
+        }
+        _LOGGER.debug("Delivery changes in last refresh: %s", self.change_counts)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose delivery changed.
+        
+        Listeners without a context are always notified. When availability
+        or staleness flips every listener is notified so entities can update
+        their state.
+        """
+        if (
+            self.last_update_success != self._last_notified_success
+            or self.stale != self._last_notified_stale
+        ):
+            self._last_notified_success = self.last_update_success
+            self._last_notified_stale = self.stale
+            super().async_update_listeners()
+            return
+        
+        if not self.last_update_success:
+            return
+        
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in self.changed_deliveries:
+                update_callback()
+
+    async def _get_data(self):
+        """Get data from the API.
+        
+        Normally only the recent list, a superset of the active one, is
+        fetched and the active list is derived from it. Every
+        VERIFY_INTERVAL polls, and on every poll after they disagreed, the
+        active list is fetched as well and compared with the derived one.
+        """
+        self._polls_until_verify -= 1
+        if self.derive_active and self._polls_until_verify > 0:
+            recent_data = await self._fetch_deliveries("recent")
+            if not recent_data.get("success"):
+                raise UpdateFailed("API reported unsuccessful request")
+            recent = recent_data.get("deliveries", [])
+            return _build_data(_derive_active(recent), recent)
+        
+        # Both filter modes are fetched concurrently over the pooled session
+        active_data, recent_data = await asyncio.gather(
+            self._fetch_deliveries("active"),
+            self._fetch_deliveries("recent"),
         )
-        recent_response.raise_for_status()
-        recent_data = recent_response.json()
         
         if not active_data.get("success") or not recent_data.get("success"):
             raise UpdateFailed("API reported unsuccessful request")
         
-        return {
-            "active": active_data.get("deliveries", []),
-            "recent": recent_data.get("deliveries", [])
-        }
+        active = active_data.get("deliveries", [])
+        recent = recent_data.get("deliveries", [])
+        self._verify_derived_active(active, recent)
+        return _build_data(active, recent)
+
+    def _verify_derived_active(self, active, recent):
+        """Compare the fetched active list with the one derived from recent."""
+        derived = {delivery["tracking_number"] for delivery in _derive_active(recent)}
+        fetched = {delivery["tracking_number"] for delivery in active}
+        matches = derived == fetched
+        if matches != self.derive_active:
+            if matches:
+                _LOGGER.info("Derived active deliveries match again, fetching one list")
+            else:
+                _LOGGER.warning(
+                    "Active deliveries derived from the recent list differ from "
+                    "the API's (%d vs %d), fetching both lists",
+                    len(derived),
+                    len(fetched),
+                )
+        self.derive_active = matches
+        self._polls_until_verify = VERIFY_INTERVAL
+
+    async def _fetch_deliveries(self, filter_mode):
+        """Fetch the deliveries response for a single filter mode."""
+        async with self.session.get(
+            API_ENDPOINT,
+            params={"filter_mode": filter_mode},
+            headers={"api-key": self.api_key},
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+        ) as response:
+            if response.status == 429:
+                raise RateLimited(
+                    parse_retry_after(response.headers.get(hdrs.RETRY_AFTER))
+                )
+            response.raise_for_status()
+            return await response.json()
+
+
+def _derive_active(recent):
+    """Return the deliveries of the recent list that are not completed."""
+    return [
+        delivery
+        for delivery in recent
+        if delivery.get("status_code") != COMPLETED_STATUS_CODE
+    ]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(value, tz):
+    """Parse an API date or epoch timestamp into an aware datetime.
+    
+    Naive values are taken to be in tz. Memoized, as the same values repeat
+    across events and refreshes.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz)
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        day = dt_util.parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed
+
+
+def _event_sort_key(event, tz):
+    """Return the sort key of an event; events without a date sort last."""
+    parsed = _parse_date(event.get("date"), tz)
+    return (parsed is not None, parsed or datetime.min.replace(tzinfo=tz))
+
+
+def _build_data(active, recent):
+    """Build the coordinator data from the active and recent lists."""
+    tz = dt_util.DEFAULT_TIME_ZONE
+    # Merged view of both lists keyed by tracking number, built once per
+    # refresh. Active deliveries take precedence over recent ones.
+    deliveries = {}
+    for delivery in active:
+        deliveries[delivery["tracking_number"]] = delivery
+    for delivery in recent:
+        deliveries.setdefault(delivery["tracking_number"], delivery)
+    
+    # Normalize once per refresh: events newest first whatever the feed's
+    # order, and the expected delivery as an aware datetime
+    expected = {}
+    for tracking_number, delivery in deliveries.items():
+        if events := delivery.get("events"):
+            # Stable sort, so events with the same or no date keep their order
+            events.sort(key=lambda event: _event_sort_key(event, tz), reverse=True)
+        expected[tracking_number] = _parse_date(
+            delivery.get("timestamp_expected"), tz
+        ) or _parse_date(delivery.get("date_expected"), tz)
+    
+    return {
+        "active": active,
+        "recent": recent,
+        "deliveries": deliveries,
+        "expected": expected,
+    }
+
+
+def _fingerprint(delivery):
+    """Return a content fingerprint for a delivery."""
+    return hash(json.dumps(delivery, sort_keys=True, separators=(",", ":")))
@@ -1,27 +1,36 @@
 """Config flow for Parcel integration."""
 from __future__ import annotations
 
-import requests
+import asyncio
+
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_API_KEY, DOMAIN, API_ENDPOINT
+from .const import CONF_API_KEY, DOMAIN, API_ENDPOINT, API_TIMEOUT
 
 
-async def validate_api_key(api_key: str) -> None:
+async def validate_api_key(hass: HomeAssistant, api_key: str) -> None:
     """Validate the API key by making a request to the Parcel API."""
+    session = async_get_clientsession(hass)
     headers = {"api-key": api_key}
     try:
-        response = requests.get(API_ENDPOINT, headers=headers, timeout=10)
-        response.raise_for_status()
-        if not response.json().get("success"):
-            raise InvalidAuth
-    except requests.RequestException:
-        raise CannotConnect
+        async with session.get(
+            API_ENDPOINT,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        raise CannotConnect from err
+    if not data.get("success"):
+        raise InvalidAuth
 
 
 class ParcelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -35,9 +44,7 @@ class ParcelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                await self.hass.async_add_executor_job(
-                    validate_api_key, user_input[CONF_API_KEY]
-                )
+                await validate_api_key(self.hass, user_input[CONF_API_KEY])
                 # Create entry
                 return self.async_create_entry(title="Parcel", data=user_input)
             except CannotConnect:
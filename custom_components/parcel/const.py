@@ -5,10 +5,23 @@ DOMAIN = "parcel"
 # API
 API_ENDPOINT = "https://api.parcel.app/external/deliveries/"
 DEFAULT_SCAN_INTERVAL = 1800  # 30 minutes (well under rate limit of 20 requests/hour)
+API_TIMEOUT = 10  # seconds per request
+BACKOFF_BASE = 60  # seconds before the first retry after a failure
+BACKOFF_MAX = 3600  # seconds, upper bound of the retry delay
+BREAKER_THRESHOLD = 5  # consecutive failures before requests are suspended
+VERIFY_INTERVAL = 12  # polls between checks of the derived active list
+
+# Storage
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds, coalesces writes after a refresh
 
 # Config
 CONF_API_KEY = "api_key"
 
+# Attributes
+EVENT_LIMIT = 5  # latest events kept in sensor attributes
+DATE_CACHE_SIZE = 4096  # distinct date values remembered by the parser
+
 # Status codes
 STATUS_CODES = {
     0: "Delivered",
@@ -21,3 +34,15 @@ STATUS_CODES = {
     7: "Exception",
     8: "Information Received"
 }
+
+COMPLETED_STATUS_CODE = 0  # deliveries with this status leave the active list
+
+# Icons per status code
+DEFAULT_ICON = "mdi:package"
+STATUS_ICONS = {
+    0: "mdi:package-variant-closed",  # Delivered
+    3: "mdi:store",                   # Ready for Pickup
+    4: "mdi:truck-delivery",          # Out for Delivery
+    6: "mdi:alert",                   # Delivery Failed
+    7: "mdi:alert-circle",            # Exception
+}
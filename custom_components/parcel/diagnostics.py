@@ -0,0 +1,27 @@
+"""Diagnostics support for Parcel."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "change_counts": coordinator.change_counts,
+        "derive_active": coordinator.derive_active,
+        # Full event timelines; sensors only carry the latest few events
+        "deliveries": coordinator.data["deliveries"] if coordinator.data else {},
+    }
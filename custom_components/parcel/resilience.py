@@ -0,0 +1,122 @@
+"""Retry backoff and circuit breaker for the Parcel API.
+
+The root and custom_components integrations carry identical copies of this
+module. They are installed separately and cannot import from each other, so
+change both copies together.
+"""
+from email.utils import parsedate_to_datetime
+import random
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import BACKOFF_BASE, BACKOFF_MAX, BREAKER_THRESHOLD
+
+
+class RateLimited(UpdateFailed):
+    """Error to indicate the API answered 429 Too Many Requests."""
+
+    def __init__(self, retry_after=None):
+        """Initialize the error."""
+        super().__init__(
+            "Rate limited by the Parcel API"
+            + (f", retry after {retry_after:.0f} seconds" if retry_after else "")
+        )
+        self.retry_after = retry_after
+
+
+class CircuitOpen(HomeAssistantError):
+    """Error to indicate requests are suspended after repeated failures."""
+
+
+def parse_retry_after(value):
+    """Return the seconds a Retry-After header asks to wait, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+class CircuitBreaker:
+    """Exponential backoff with jitter and a circuit breaker.
+
+    Every failure pushes the next attempt back by a jittered, exponentially
+    growing delay. After BREAKER_THRESHOLD consecutive failures, or as soon
+    as the API rate limits us, the circuit opens and no requests are made
+    until the delay has passed; the first request after that is the trial
+    that closes it again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        base: float = BACKOFF_BASE,
+        maximum: float = BACKOFF_MAX,
+    ):
+        """Initialize the breaker."""
+        self.threshold = threshold
+        self.base = base
+        self.maximum = maximum
+        self.failures = 0
+        self.opened = False
+        self._retry_at = None
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if not self.opened:
+            return "closed"
+        if self.seconds_until_retry():
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Return True if a request may be made now."""
+        return self.state != "open"
+
+    def seconds_until_retry(self) -> float:
+        """Return the seconds until the next attempt is due."""
+        if self._retry_at is None:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def backoff(self) -> float:
+        """Return the jittered delay for the current number of failures."""
+        delay = min(self.maximum, self.base * 2 ** max(0, self.failures - 1))
+        # Equal jitter: keep at least half the delay, randomize the rest so
+        # entries failing together don't retry in lockstep
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self.opened = False
+        self._retry_at = None
+
+    def record_failure(self, retry_after: float = None) -> float:
+        """Record a failed request and return the delay until the next one."""
+        self.failures += 1
+        delay = self.backoff()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self._retry_at = time.monotonic() + delay
+        if retry_after is not None or self.failures >= self.threshold:
+            self.opened = True
+        return delay
+
+    def as_dict(self) -> dict:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.seconds_until_retry(), 1),
+        }
@@ -1,16 +1,16 @@
 """Sensor platform for Parcel integration."""
 from __future__ import annotations
 
-from datetime import datetime
 import logging
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, STATUS_CODES
+from .const import DEFAULT_ICON, DOMAIN, EVENT_LIMIT, STATUS_CODES, STATUS_ICONS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,110 +20,153 @@ async def async_setup_entry(
     """Set up Parcel sensor entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
-    sensors = []
+    sensors = {}
     
-    # First refresh
-    await coordinator.async_config_entry_first_refresh()
+    # Add a sensor per delivery; the merged view is already deduplicated
+    if coordinator.data:
+        active = {d["tracking_number"] for d in coordinator.data["active"]}
+        for tracking_number, delivery in coordinator.data["deliveries"].items():
+            delivery_type = "active" if tracking_number in active else "recent"
+            sensors[tracking_number] = ParcelDeliverySensor(
+                coordinator, delivery, delivery_type
+            )
     
-    # Add active deliveries sensors
-    if coordinator.data and "active" in coordinator.data:
-        for delivery in coordinator.data["active"]:
-            sensors.append(ParcelDeliverySensor(coordinator, delivery, "active"))
+    # Remove registry entries for deliveries that vanished while HA was down,
+    # unless the first refresh failed and there is nothing to compare against
+    if coordinator.data is not None:
+        registry = er.async_get(hass)
+        for registry_entry in er.async_entries_for_config_entry(
+            registry, entry.entry_id
+        ):
+            if (
+                registry_entry.domain == "sensor"
+                and registry_entry.unique_id not in sensors
+            ):
+                registry.async_remove(registry_entry.entity_id)
     
-    # Add recent deliveries sensors
-    if coordinator.data and "recent" in coordinator.data:
-        for delivery in coordinator.data["recent"]:
-            # Only add if not already added
-            if not any(s.unique_id == delivery["tracking_number"] for s in sensors):
-                sensors.append(ParcelDeliverySensor(coordinator, delivery, "recent"))
+    async_add_entities(list(sensors.values()))
     
-    async_add_entities(sensors, True)
+    @callback
+    def _async_reconcile_sensors() -> None:
+        """Add sensors for new deliveries and retire those that left the feed.
+        
+        Only the deliveries reported as changed by the coordinator are
+        visited, so the cost follows the size of the delta.
+        """
+        if not coordinator.data:
+            return
+        deliveries = coordinator.data["deliveries"]
+        new_sensors = []
+        active = None
+        for tracking_number in coordinator.changed_deliveries:
+            delivery = deliveries.get(tracking_number)
+            if delivery is not None:
+                if tracking_number in sensors:
+                    continue
+                if active is None:
+                    active = {d["tracking_number"] for d in coordinator.data["active"]}
+                delivery_type = "active" if tracking_number in active else "recent"
+                sensor = ParcelDeliverySensor(coordinator, delivery, delivery_type)
+                sensors[tracking_number] = sensor
+                new_sensors.append(sensor)
+            elif (sensor := sensors.pop(tracking_number, None)) is not None:
+                _LOGGER.debug("Removing sensor for delivery %s", tracking_number)
+                if sensor.registry_entry is not None:
+                    # Removing the registry entry also removes the entity
+                    registry.async_remove(sensor.entity_id)
+                else:
+                    hass.async_create_task(sensor.async_remove())
+        
+        if new_sensors:
+            _LOGGER.debug("Adding %d new delivery sensors", len(new_sensors))
+            async_add_entities(new_sensors)
+    
+    entry.async_on_unload(coordinator.async_add_listener(_async_reconcile_sensors))
 
 
 class ParcelDeliverySensor(CoordinatorEntity, SensorEntity):
     """Representation of a Parcel delivery sensor."""
 
+    # Keep the event list out of the recorder; diagnostics has the full timeline
+    _unrecorded_attributes = frozenset({"events"})
+
     def __init__(self, coordinator, delivery, delivery_type):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Use the tracking number as listener context so the coordinator only
+        # notifies this sensor when its delivery changes
+        super().__init__(coordinator, context=delivery["tracking_number"])
         self._delivery = delivery
         self._delivery_type = delivery_type
         self._tracking_number = delivery["tracking_number"]
         self._description = delivery["description"]
         self._attr_name = f"Parcel {self._description}"
         self._attr_unique_id = self._tracking_number
+        self._update_from_delivery()
         
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        status_code = self._get_current_delivery().get("status_code")
-        return STATUS_CODES.get(status_code, "Unknown")
-    
-    @property
-    def icon(self):
-        """Return the icon of the sensor."""
-        status_code = self._get_current_delivery().get("status_code")
-        if status_code == 0:  # Delivered
-            return "mdi:package-variant-closed"
-        elif status_code == 4:  # Out for delivery
-            return "mdi:truck-delivery"
-        elif status_code == 3:  # Ready for pickup
-            return "mdi:store"
-        elif status_code == 6:  # Delivery failed
-            return "mdi:alert"
-        elif status_code == 7:  # Exception
-            return "mdi:alert-circle"
-        else:
-            return "mdi:package"
-    
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
+    def _update_from_delivery(self):
+        """Compute the state, icon and attributes from the current delivery.
+        
+        Runs once per coordinator update; HA reads the cached values on every
+        state write.
+        """
         delivery = self._get_current_delivery()
+        status_code = delivery.get("status_code")
+        status = STATUS_CODES.get(status_code, "Unknown")
+        self._attr_native_value = status
+        self._attr_icon = STATUS_ICONS.get(status_code, DEFAULT_ICON)
+        
         attrs = {
             "tracking_number": delivery.get("tracking_number"),
             "description": delivery.get("description"),
             "carrier": delivery.get("carrier_code"),
-            "status_code": delivery.get("status_code"),
-            "status": STATUS_CODES.get(delivery.get("status_code"), "Unknown"),
+            "status_code": status_code,
+            "status": status,
+            # Set while the last known data is served after failed refreshes
+            "stale": self.coordinator.stale,
         }
         
         # Add expected delivery date if available
         if date_expected := delivery.get("date_expected"):
             attrs["expected_date"] = date_expected
             
-        if timestamp_expected := delivery.get("timestamp_expected"):
-            attrs["expected_timestamp"] = datetime.fromtimestamp(timestamp_expected).isoformat()
+        # Parsed once per refresh by the coordinator, in HA's time zone
+        if delivery.get("timestamp_expected") and (
+            expected := self.coordinator.data["expected"].get(self._tracking_number)
+        ):
+            attrs["expected_timestamp"] = expected.isoformat()
         
         # Add events if available
         events = delivery.get("events", [])
         if events:
-            # Get the latest event
-            latest_event = events[0] if events else {}
+            # The coordinator sorts events newest first
+            latest_event = events[0]
             
             attrs["latest_event"] = latest_event.get("event")
             attrs["latest_event_date"] = latest_event.get("date")
             attrs["latest_event_location"] = latest_event.get("location")
             
-            # Add all events
-            attrs["events"] = events
+            # Add the latest events only, to keep state rows small
+            attrs["event_count"] = len(events)
+            attrs["events"] = events[:EVENT_LIMIT]
         
-        return attrs
+        self._attr_extra_state_attributes = attrs
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data for this delivery from the coordinator."""
+        self._update_from_delivery()
+        super()._handle_coordinator_update()
     
     def _get_current_delivery(self):
         """Get the current delivery data."""
         if not self.coordinator.data:
             return {}
             
-        # Look in active deliveries first
-        for delivery in self.coordinator.data.get("active", []):
-            if delivery["tracking_number"] == self._tracking_number:
-                return delivery
-                
-        # Then check recent deliveries
-        for delivery in self.coordinator.data.get("recent", []):
-            if delivery["tracking_number"] == self._tracking_number:
-                return delivery
-                
         # Return the last known state if not found
-        return self._delivery
+        return self.coordinator.data["deliveries"].get(
+            self._tracking_number, self._delivery
+        )
+
+    async def async_update(self) -> None:
+        """Serve the cached delivery instead of requesting a refresh."""
+        self._update_from_delivery()
@@ -0,0 +1,73 @@
+"""JSON decoding of Parcel API responses."""
+import json
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DECODE_EXECUTOR_THRESHOLD
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+if orjson is not None:
+    BACKEND = "orjson"
+    loads = orjson.loads
+else:
+    BACKEND = "json"
+    loads = json.loads
+
+
+class DecodeStats:
+    """Size and timing of the last decoded payload."""
+
+    __slots__ = ("size", "duration", "offloaded")
+
+    def __init__(self, size=0, duration=0.0, offloaded=False):
+        """Initialize the stats."""
+        self.size = size
+        self.duration = duration
+        self.offloaded = offloaded
+
+    def as_dict(self) -> dict:
+        """Return the stats for diagnostics."""
+        return {
+            "backend": BACKEND,
+            "size": self.size,
+            "duration": round(self.duration, 6),
+            "offloaded": self.offloaded,
+        }
+
+
+def _timed_loads(body: bytes):
+    """Decode the body and return the result with the time it took."""
+    start = time.perf_counter()
+    data = loads(body)
+    return data, time.perf_counter() - start
+
+
+async def async_decode(hass: HomeAssistant, body: bytes):
+    """Decode a raw response body.
+
+    The body is decoded straight from bytes. Payloads larger than
+    DECODE_EXECUTOR_THRESHOLD are decoded in the executor so a big account
+    does not stall the event loop. Returns the data and a DecodeStats.
+    """
+    offloaded = len(body) > DECODE_EXECUTOR_THRESHOLD
+    if offloaded:
+        data, duration = await hass.async_add_executor_job(_timed_loads, body)
+    else:
+        data, duration = _timed_loads(body)
+
+    _LOGGER.debug(
+        "Decoded %d bytes with %s in %.3f ms%s",
+        len(body),
+        BACKEND,
+        duration * 1000,
+        " in the executor" if offloaded else "",
+    )
+    return data, DecodeStats(len(body), duration, offloaded)
@@ -0,0 +1,34 @@
+"""Diagnostics support for Parcel Package Tracking."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_API_KEY
+
+# Anyone on the local network who knows the webhook ID can push updates
+TO_REDACT = {CONF_API_KEY, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "packages": len(coordinator.packages),
+        "archived": [
+            coordinator.archive.get(tracking_number)
+            for tracking_number in coordinator.archive
+        ],
+        "change_counts": coordinator.change_counts,
+        "scheduler": coordinator.scheduler.as_dict(),
+        "hub": coordinator.hub.as_dict(),
+        "decode": coordinator.decode_stats.as_dict(),
+        "metrics": {
+            **coordinator.metrics.as_dict(),
+            "quota_remaining": coordinator.scheduler.remaining,
+        },
+        # Full event timelines, which sensors only expose in bounded form
+        "deliveries": [delivery.as_dict() for delivery in coordinator.data or ()],
+    }
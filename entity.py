@@ -0,0 +1,17 @@
+"""Base entity for Parcel Package Tracking."""
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+
+class ParcelEntity(CoordinatorEntity):
+    """Coordinator entity on the shared Parcel device."""
+
+    _attr_device_info = DeviceInfo(
+        identifiers={(DOMAIN, "parcel_tracker")},
+        name="Parcel Package Tracker",
+        manufacturer="Parcel",
+        model="Package Tracker",
+        sw_version="1.0.0",
+    )
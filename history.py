@@ -0,0 +1,140 @@
+"""Local event history for Parcel Package Tracking."""
+from datetime import timedelta
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    HISTORY_COMPACT_INTERVAL,
+    HISTORY_RETENTION_DAYS,
+    HISTORY_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventHistory:
+    """Append-only event history keyed by tracking number.
+
+    Events are deduplicated by (date, event, location) and stored on disk as
+    compact lists instead of dicts. The API only returns the current window
+    of deliveries, so this keeps timelines around after a package has left it.
+    """
+
+    def __init__(self, store: Store):
+        """Initialize the history."""
+        self._store = store
+        # tracking number -> {"seen": iso timestamp, "events": [[date, event, location]]},
+        # seen last set when the package changed or left the feed
+        self._packages = {}
+        # tracking number -> set of event keys, for constant-time dedup
+        self._keys = {}
+        self._last_compacted = None
+
+    async def async_load(self) -> None:
+        """Load the history from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        self._packages = stored["packages"]
+        self._keys = {
+            tracking_number: {tuple(event) for event in history["events"]}
+            for tracking_number, history in self._packages.items()
+        }
+        if stored.get("compacted"):
+            self._last_compacted = dt_util.parse_datetime(stored["compacted"])
+
+    @callback
+    def async_merge(self, packages: dict, tracking_numbers) -> int:
+        """Merge the events of the given packages into the history.
+
+        Only the packages listed in tracking_numbers are visited, typically
+        the ones that changed in the last refresh, so the cost follows the
+        number of new events rather than the size of the history. Returns
+        the number of events appended.
+        """
+        now = dt_util.utcnow()
+        appended = 0
+        left = 0
+
+        for tracking_number in tracking_numbers:
+            package = packages.get(tracking_number)
+            if package is None:
+                # The package left the feed; retention counts from now
+                history = self._packages.get(tracking_number)
+                if history is not None:
+                    history["seen"] = now.isoformat()
+                    left += 1
+                continue
+
+            history = self._packages.setdefault(
+                tracking_number, {"seen": None, "events": []}
+            )
+            history["seen"] = now.isoformat()
+            keys = self._keys.setdefault(tracking_number, set())
+
+            # The feed lists the newest event first; append oldest first so
+            # each stored timeline stays in chronological order
+            for event in reversed(package.events):
+                key = event.key
+                if key in keys:
+                    continue
+                keys.add(key)
+                history["events"].append(list(key))
+                appended += 1
+
+        if self._last_compacted is None:
+            self._last_compacted = now
+        elif now - self._last_compacted >= timedelta(hours=HISTORY_COMPACT_INTERVAL):
+            self._async_compact(now, packages)
+
+        if appended or left:
+            _LOGGER.debug("Appended %d events to the history", appended)
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+        return appended
+
+    @callback
+    def _async_compact(self, now, packages: dict) -> None:
+        """Drop histories of packages that left the feed long ago."""
+        cutoff = now - timedelta(days=HISTORY_RETENTION_DAYS)
+        expired = [
+            tracking_number
+            for tracking_number, history in self._packages.items()
+            if tracking_number not in packages
+            and dt_util.parse_datetime(history["seen"]) < cutoff
+        ]
+        for tracking_number in expired:
+            del self._packages[tracking_number]
+            del self._keys[tracking_number]
+
+        self._last_compacted = now
+        _LOGGER.debug("Compacted history, dropped %d packages", len(expired))
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    def events(self, tracking_number: str) -> list:
+        """Return the stored timeline of a package, oldest event first."""
+        history = self._packages.get(tracking_number)
+        if history is None:
+            return []
+        return [
+            {"date": date, "event": event, "location": location}
+            for date, event, location in history["events"]
+        ]
+
+    def __contains__(self, tracking_number: str) -> bool:
+        """Return True if a timeline is stored for the tracking number."""
+        return tracking_number in self._packages
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the history to persist."""
+        return {
+            "compacted": self._last_compacted.isoformat()
+            if self._last_compacted
+            else None,
+            "packages": self._packages,
+        }
@@ -0,0 +1,227 @@
+"""Shared Parcel API fetcher for Parcel Package Tracking."""
+import asyncio
+from collections import deque
+import hashlib
+import logging
+import time
+
+import aiohttp
+import async_timeout
+
+from aiohttp import hdrs
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import API_ENDPOINT, HUB_SHARE_WINDOW
+from .decoder import async_decode
+from .metrics import RefreshMetrics
+from .resilience import CircuitBreaker, CircuitOpen, RateLimited, parse_retry_after
+from .scheduler import PollScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class QuotaExhausted(HomeAssistantError):
+    """Error to indicate the hourly API quota is spent."""
+
+
+class FetchResult:
+    """Deliveries of one filter mode as last fetched by the hub."""
+
+    __slots__ = ("version", "deliveries", "decode_stats", "fetched")
+
+    def __init__(self, version, deliveries, decode_stats, fetched):
+        """Initialize the result."""
+        self.version = version
+        self.deliveries = deliveries
+        self.decode_stats = decode_stats
+        self.fetched = fetched
+
+
+class ParcelFetchHub:
+    """Fetcher shared by every config entry that uses the same API key.
+
+    Concurrent fetches of a filter mode are coalesced into a single in-flight
+    request, and a result another entry fetched moments ago is reused rather
+    than spending quota again. Each result carries a version, so subscribers
+    can tell whether they have already processed it.
+    """
+
+    def __init__(self, hass: HomeAssistant, session: aiohttp.ClientSession, api_key):
+        """Initialize the hub."""
+        self.hass = hass
+        self.session = session
+        self.api_key = api_key
+        # Entry ids of the config entries using this hub
+        self.subscribers = set()
+        # Request timestamps, shared by the schedulers of all subscribers
+        # since the hourly quota applies to the key and not to an entry
+        self.calls = deque()
+        # Backoff and circuit state, shared since an outage or rate limit
+        # affects every entry using the key
+        self.breaker = CircuitBreaker()
+        self.requests = 0
+        self.coalesced = 0
+        self._version = 0
+        self._inflight = {}
+        self._results = {}
+        # filter mode -> (etag, last modified, body digest) of the last result
+        self._validators = {}
+
+    async def async_fetch(
+        self,
+        filter_mode: str,
+        scheduler: PollScheduler,
+        metrics: RefreshMetrics,
+        seen_version: int = None,
+    ) -> FetchResult:
+        """Return the current deliveries of a filter mode.
+
+        A recent result is only reused when the caller has not seen it yet, so
+        an entry refreshing again always gets a new request. Only the caller
+        that actually starts a request spends quota from its scheduler and
+        records the request in its metrics. Raises QuotaExhausted when a
+        request is needed but the quota is spent, and CircuitOpen while
+        requests are suspended after repeated failures.
+        """
+        inflight = self._inflight.get(filter_mode)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        result = self._results.get(filter_mode)
+        if (
+            result is not None
+            and result.version != seen_version
+            and time.monotonic() - result.fetched < HUB_SHARE_WINDOW
+        ):
+            self.coalesced += 1
+            return result
+
+        if not self.breaker.allow():
+            raise CircuitOpen(
+                "Parcel API requests suspended for "
+                f"{self.breaker.seconds_until_retry():.0f} seconds"
+            )
+
+        if not scheduler.try_acquire():
+            raise QuotaExhausted("Hourly Parcel API quota exhausted")
+
+        task = self.hass.async_create_task(
+            self._async_request(filter_mode, metrics), f"parcel fetch {filter_mode}"
+        )
+        self._inflight[filter_mode] = task
+        return await asyncio.shield(task)
+
+    async def _async_request(self, filter_mode: str, metrics: RefreshMetrics):
+        """Request the deliveries of a filter mode from the Parcel API."""
+        try:
+            async with async_timeout.timeout(30):
+                result = await self._async_request_data(filter_mode, metrics)
+        except RateLimited as err:
+            self.breaker.record_failure(err.retry_after)
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._inflight.pop(filter_mode, None)
+
+        self.breaker.record_success()
+        return result
+
+    async def _async_request_data(self, filter_mode: str, metrics: RefreshMetrics):
+        """Get the latest data from the Parcel API.
+
+        The previous result is returned, with its version, when the server
+        answers 304 Not Modified or the body is byte-identical to the last one.
+        """
+        self.requests += 1
+        previous = self._results.get(filter_mode)
+        etag, last_modified, body_digest = self._validators.get(
+            filter_mode, (None, None, None)
+        )
+
+        url = f"{API_ENDPOINT}?filter_mode={filter_mode}"
+        headers = {
+            "api-key": self.api_key,
+            hdrs.ACCEPT_ENCODING: "gzip, deflate",
+        }
+        if etag:
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+
+        start = time.monotonic()
+        async with self.session.get(url, headers=headers) as resp:
+            if resp.status == 304 and previous is not None:
+                metrics.record_request(time.monotonic() - start, 0)
+                previous.fetched = time.monotonic()
+                return previous
+
+            if resp.status == 429:
+                raise RateLimited(
+                    parse_retry_after(resp.headers.get(hdrs.RETRY_AFTER))
+                )
+
+            resp.raise_for_status()
+            body = await resp.read()
+            metrics.record_request(time.monotonic() - start, len(body))
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            if digest == body_digest and previous is not None:
+                previous.fetched = time.monotonic()
+                return previous
+
+            data, decode_stats = await async_decode(self.hass, body)
+            metrics.record_decode(decode_stats.duration)
+
+            if not data.get("success", False):
+                error_msg = data.get("error_message", "Unknown error")
+                _LOGGER.error("API error: %s", error_msg)
+                raise UpdateFailed(f"API error: {error_msg}")
+
+            self._validators[filter_mode] = (
+                resp.headers.get(hdrs.ETAG),
+                resp.headers.get(hdrs.LAST_MODIFIED),
+                digest,
+            )
+
+        self._version += 1
+        result = FetchResult(
+            self._version,
+            data.get("deliveries", []),
+            decode_stats,
+            time.monotonic(),
+        )
+        self._results[filter_mode] = result
+        return result
+
+    def invalidate(self, filter_mode: str) -> None:
+        """Forget the last result of a filter mode and its validators.
+
+        The next fetch then makes a full request rather than reusing a result
+        that pushed updates have superseded.
+        """
+        self._results.pop(filter_mode, None)
+        self._validators.pop(filter_mode, None)
+
+    def cached_result(self, filter_mode: str, max_age: float):
+        """Return the last result of a filter mode if it is recent enough."""
+        result = self._results.get(filter_mode)
+        if result is None or time.monotonic() - result.fetched >= max_age:
+            return None
+        return result
+
+    def as_dict(self) -> dict:
+        """Return the hub state for diagnostics."""
+        return {
+            "subscribers": len(self.subscribers),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "breaker": self.breaker.as_dict(),
+            "versions": {
+                filter_mode: result.version
+                for filter_mode, result in self._results.items()
+            },
+        }
@@ -1,31 +1,58 @@
 """The Parcel Package Tracking integration."""
 import asyncio
+import json
 import logging
 from datetime import timedelta
 
 import aiohttp
-import async_timeout
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
-    API_ENDPOINT,
     CONF_API_KEY,
     CONF_FILTER_MODE,
     CONF_SCAN_INTERVAL,
+    CONF_EVENT_LIMIT,
+    CONF_SUMMARY_ONLY,
+    CONF_ARCHIVE_DAYS,
+    CONF_PUSH,
+    BACKOFF_BASE,
+    COMPLETED_STATUS_CODE,
+    DATA_HUBS,
     DEFAULT_FILTER_MODE,
+    DEFAULT_EVENT_LIMIT,
+    DEFAULT_SUMMARY_ONLY,
+    DEFAULT_ARCHIVE_DAYS,
+    DEFAULT_PUSH,
     DEFAULT_SCAN_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
 )
+from .archive import DeliveryArchive
+from .decoder import DecodeStats
+from .history import EventHistory
+from .hub import ParcelFetchHub, QuotaExhausted
+from .metrics import METRICS_CONTEXT, RefreshMetrics
+from .options_flow import entry_unique_id
+from .resilience import CircuitOpen, RateLimited
+from .model import Delivery
+from .push import async_setup_push
+from .scheduler import PollScheduler
+from .search import DeliveryIndex
+from .services import async_setup_services, async_unload_services
+from .summary import SUMMARY_CONTEXT, DeliverySummary
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["sensor"]
+PLATFORMS = ["sensor", "calendar"]
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
@@ -37,32 +64,140 @@ async def async_setup(hass: HomeAssistant, config: dict):
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Parcel from a config entry."""
     api_key = entry.data[CONF_API_KEY]
-    filter_mode = entry.data.get(CONF_FILTER_MODE, DEFAULT_FILTER_MODE)
+    filter_mode = _get_option(entry, CONF_FILTER_MODE, DEFAULT_FILTER_MODE)
     
     # Calculate scan interval in seconds
-    scan_interval_minutes = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    scan_interval_minutes = _get_option(entry, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     scan_interval = timedelta(minutes=scan_interval_minutes)
+    event_limit = _get_option(entry, CONF_EVENT_LIMIT, DEFAULT_EVENT_LIMIT)
+    archive_days = _get_option(entry, CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS)
+    push = _get_option(entry, CONF_PUSH, DEFAULT_PUSH)
 
-    session = async_get_clientsession(hass)
+    hub = _async_subscribe_hub(hass, entry, api_key)
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+    history = EventHistory(
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history")
+    )
+    await history.async_load()
+    archive = DeliveryArchive(
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.archive")
+    )
+    await archive.async_load()
     coordinator = ParcelDataUpdateCoordinator(
-        hass, session, api_key, filter_mode, scan_interval
+        hass,
+        hub,
+        filter_mode,
+        scan_interval,
+        store,
+        history,
+        archive,
+        event_limit,
+        archive_days,
     )
+    # Pushed updates make frequent polling unnecessary
+    coordinator.scheduler.push = push
+    coordinator.summary_only = _get_option(entry, CONF_SUMMARY_ONLY, DEFAULT_SUMMARY_ONLY)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Restore the last good snapshot so entities are created immediately,
+    # without waiting on the API or spending quota during startup
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        # A failed first refresh is retried by the coordinator with backoff;
+        # raising ConfigEntryNotReady would retry on HA's schedule instead,
+        # spending quota while the API is struggling
+        await coordinator.async_refresh()
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+        if not coordinator.last_update_success:
+            _LOGGER.warning(
+                "Initial Parcel refresh failed, retrying in %s",
+                coordinator.update_interval,
+            )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    if not hass.services.has_service(DOMAIN, "refresh"):
+        await async_setup_services(hass)
 
     for platform in PLATFORMS:
         hass.async_create_task(
             hass.config_entries.async_forward_entry_setup(entry, platform)
         )
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    if push:
+        async_setup_push(hass, entry, coordinator)
+
+    if restored and coordinator.snapshot_is_stale:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} snapshot refresh"
+        )
+
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Migrate an old config entry.
+
+    Version 1 allowed one entry per API key and keyed package sensors by the
+    tracking number alone. Version 2 adds the filter mode to the entry's
+    unique ID and the entry ID to the package sensors', so entries of the
+    same key can track the same package.
+    """
+    if entry.version == 1:
+        prefix = f"parcel_{entry.entry_id}_"
+
+        @callback
+        def _migrate_unique_id(registry_entry: er.RegistryEntry):
+            """Scope a package sensor's unique ID to the entry."""
+            if registry_entry.unique_id.startswith(prefix):
+                return None
+            tracking_number = registry_entry.unique_id.removeprefix("parcel_")
+            return {"new_unique_id": f"{prefix}{tracking_number}"}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+        hass.config_entries.async_update_entry(
+            entry,
+            unique_id=entry_unique_id(
+                entry.data[CONF_API_KEY],
+                _get_option(entry, CONF_FILTER_MODE, DEFAULT_FILTER_MODE),
+            ),
+            version=2,
+        )
+        _LOGGER.debug("Migrated config entry %s to version 2", entry.entry_id)
+
     return True
 
 
+def _get_option(entry: ConfigEntry, key: str, default):
+    """Return an option, falling back to the value set up with the entry."""
+    return entry.options.get(key, entry.data.get(key, default))
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply changed options to the running coordinator.
+
+    Only options that add or remove entities or the webhook reload the
+    entry; everything else is reconfigured in place so entities survive.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if (
+        _get_option(entry, CONF_SUMMARY_ONLY, DEFAULT_SUMMARY_ONLY)
+        != coordinator.summary_only
+        or _get_option(entry, CONF_PUSH, DEFAULT_PUSH) != coordinator.scheduler.push
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    await coordinator.async_apply_options(
+        _get_option(entry, CONF_FILTER_MODE, DEFAULT_FILTER_MODE),
+        timedelta(
+            minutes=_get_option(entry, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        ),
+        _get_option(entry, CONF_EVENT_LIMIT, DEFAULT_EVENT_LIMIT),
+        _get_option(entry, CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS),
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     unload_ok = all(
@@ -75,26 +210,102 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     )
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        _async_unsubscribe_hub(hass, entry, entry.data[CONF_API_KEY])
+        if not hass.data[DOMAIN]:
+            await async_unload_services(hass)
 
     return unload_ok
 
 
+@callback
+def _async_subscribe_hub(hass: HomeAssistant, entry: ConfigEntry, api_key: str):
+    """Return the fetch hub of an API key, creating it for the first entry."""
+    hubs = hass.data.setdefault(DATA_HUBS, {})
+    hub = hubs.get(api_key)
+    if hub is None:
+        hub = hubs[api_key] = ParcelFetchHub(
+            hass, async_get_clientsession(hass), api_key
+        )
+    hub.subscribers.add(entry.entry_id)
+    return hub
+
+
+@callback
+def _async_unsubscribe_hub(hass: HomeAssistant, entry: ConfigEntry, api_key: str):
+    """Drop an entry from its fetch hub, removing the hub after the last one."""
+    hub = hass.data[DATA_HUBS][api_key]
+    hub.subscribers.discard(entry.entry_id)
+    if not hub.subscribers:
+        del hass.data[DATA_HUBS][api_key]
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored snapshot, history and archive of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history"
+    ).async_remove()
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.archive"
+    ).async_remove()
+
+
 class ParcelDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Parcel data."""
 
     def __init__(
         self, 
-        hass: HomeAssistant, 
-        session: aiohttp.ClientSession, 
-        api_key: str, 
+        hass: HomeAssistant,
+        hub: ParcelFetchHub,
         filter_mode: str,
         scan_interval: timedelta,
+        store: Store,
+        history: EventHistory,
+        archive: DeliveryArchive,
+        event_limit: int = DEFAULT_EVENT_LIMIT,
+        archive_days: int = DEFAULT_ARCHIVE_DAYS,
     ):
         """Initialize the coordinator."""
-        self.session = session
-        self.api_key = api_key
+        # Fetches are shared with the other entries using the same API key
+        self.hub = hub
         self.filter_mode = filter_mode
+        # Number of latest events sensors keep in their attributes
+        self.event_limit = event_limit
+        # Whether only the summary sensors are created, set by the entry
+        self.summary_only = False
         self.hass = hass
+        # Snapshot of the last good deliveries, persisted for quick startup
+        self._store = store
+        self.snapshot_time = None
+        # Local timelines that outlive the API's deliveries window
+        self.history = history
+        # Completed packages moved out of the live set after archive_after
+        self.archive = archive
+        self.archive_after = timedelta(days=archive_days) if archive_days else None
+        # tracking number -> when the package was first seen completed
+        self._completed_since = {}
+        # Index of the latest Delivery objects keyed by tracking number
+        self.packages = {}
+        # Content fingerprints of the previous refresh, used to diff packages
+        self._fingerprints = {}
+        # Tracking numbers added, changed or removed by the last refresh
+        self.changed_packages = set()
+        self.change_counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        self._last_notified_success = True
+        # Aggregates over all packages, updated from the diff of each refresh
+        self.summary = DeliverySummary()
+        self._summary_changed = False
+        # Lookup indexes for parcel.search, updated from the same diff
+        self.index = DeliveryIndex()
+        self.scheduler = PollScheduler(scan_interval, calls=hub.calls)
+        # Version of the last hub result processed by this coordinator
+        self._version = None
+        # Size and decode time of the last payload that was decoded
+        self.decode_stats = DecodeStats()
+        self.metrics = RefreshMetrics()
+        # True while the last good data is served after failed refreshes
+        self.stale = False
+        self._last_notified_stale = False
 
         super().__init__(
             hass,
@@ -106,26 +317,378 @@ class ParcelDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Fetch data from the Parcel API."""
         try:
-            with async_timeout.timeout(30):
-                return await self._fetch_data()
+            result = await self.hub.async_fetch(
+                self.filter_mode, self.scheduler, self.metrics, self._version
+            )
+        except QuotaExhausted as err:
+            # Serve the cached data rather than exceed the hourly quota
+            if self.data is None:
+                self.metrics.record_failure("quota", err)
+                raise UpdateFailed(str(err))
+            _LOGGER.warning(
+                "Skipping Parcel API request, hourly quota exhausted; "
+                "next request possible in %.0f seconds",
+                self.scheduler.seconds_until_available(),
+            )
+            self.update_interval = self.scheduler.async_next_interval(
+                self.packages.values()
+            )
+            self._mark_unchanged()
+            self.metrics.record_success()
+            return self.data
+        except CircuitOpen as err:
+            return self._serve_stale(None, err)
+        except RateLimited as err:
+            return self._serve_stale("rate_limited", err)
+        except UpdateFailed as err:
+            return self._serve_stale("api_error", err)
+        except aiohttp.ClientResponseError as err:
+            return self._serve_stale(
+                "http_error", UpdateFailed(f"Parcel API returned HTTP {err.status}")
+            )
         except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
+            return self._serve_stale(
+                "client_error", UpdateFailed(f"Error communicating with API: {err}")
+            )
         except asyncio.TimeoutError:
-            raise UpdateFailed("Timeout fetching data from Parcel API")
+            return self._serve_stale(
+                "timeout", UpdateFailed("Timeout fetching data from Parcel API")
+            )
         except Exception as err:
-            raise UpdateFailed(f"Unexpected error occurred: {err}")
-
-    async def _fetch_data(self):
-        """Get the latest data from the Parcel API."""
-        url = f"{API_ENDPOINT}?filter_mode={self.filter_mode}"
-        headers = {"api-key": self.api_key}
-
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
-            
-            if not data.get("success", False):
-                error_msg = data.get("error_message", "Unknown error")
-                _LOGGER.error("API error: %s", error_msg)
-                raise UpdateFailed(f"API error: {error_msg}")
-                
-            return data.get("deliveries", [])
+            return self._serve_stale(
+                "unexpected", UpdateFailed(f"Unexpected error occurred: {err}")
+            )
+
+        if result.version == self._version:
+            # Nothing changed upstream, skip decoding and all entity work
+            _LOGGER.debug("Parcel deliveries unchanged since last fetch")
+            self._mark_unchanged()
+            self.update_interval = self.scheduler.async_next_interval(
+                self.packages.values()
+            )
+            self.stale = False
+            self.metrics.record_success()
+            if self._archive_completed():
+                self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+                return list(self.packages.values())
+            return self.data
+
+        deliveries = self._apply_result(result)
+        self.stale = False
+        self.metrics.record_success()
+        return deliveries
+
+    def _apply_result(self, result):
+        """Take over a new hub result and return its Delivery objects."""
+        self._version = result.version
+        self.decode_stats = result.decode_stats
+        deliveries = self._set_packages(result.deliveries)
+        self.history.async_merge(self.packages, self.changed_packages)
+        self.update_interval = self.scheduler.async_next_interval(
+            self.packages.values()
+        )
+        self.snapshot_time = dt_util.utcnow()
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        return deliveries
+
+    async def async_apply_options(
+        self,
+        filter_mode: str,
+        scan_interval: timedelta,
+        event_limit: int,
+        archive_days: int,
+    ) -> None:
+        """Reconfigure the coordinator for changed options.
+
+        A new scan interval applies from the next poll. A new filter mode is
+        served from the hub's last result for it when that is younger than
+        the scan interval, and fetched otherwise.
+        """
+        self.changed_packages = set()
+        self._summary_changed = False
+        publish = refresh = False
+
+        if scan_interval != self.scheduler.scan_interval:
+            self.scheduler.scan_interval = scan_interval
+            if not self.stale:
+                # While stale the retry delay comes from the backoff instead
+                self.update_interval = self.scheduler.async_next_interval(
+                    self.packages.values()
+                )
+
+        self.archive_after = timedelta(days=archive_days) if archive_days else None
+        if filter_mode != self.filter_mode:
+            _LOGGER.debug("Switching filter mode to %s", filter_mode)
+            self.filter_mode = filter_mode
+            self._version = None
+            result = self.hub.cached_result(
+                filter_mode, scan_interval.total_seconds()
+            )
+            if result is not None:
+                self._apply_result(result)
+                publish = True
+            else:
+                refresh = True
+        elif self._archive_completed():
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+            publish = True
+
+        if event_limit != self.event_limit:
+            self.event_limit = event_limit
+            # Every package sensor trims its events to the limit
+            self.changed_packages = self.changed_packages | self.packages.keys()
+
+        if publish:
+            self.async_set_updated_data(list(self.packages.values()))
+        elif self.changed_packages:
+            self.async_update_listeners()
+        if refresh:
+            await self.async_request_refresh()
+
+    def _serve_stale(self, kind, err):
+        """Handle a failed refresh by serving the last good data.
+
+        The next attempt is scheduled by the hub's backoff instead of the
+        regular interval. Entities stay available and are marked stale; only
+        without any data to serve is the failure raised. A kind of None means
+        no request was made because the circuit is open.
+        """
+        if kind is not None:
+            self.metrics.record_failure(kind, err)
+        retry_in = self.hub.breaker.seconds_until_retry() or BACKOFF_BASE
+        self.update_interval = timedelta(seconds=retry_in)
+
+        if self.data is None:
+            raise UpdateFailed(str(err)) from err
+
+        _LOGGER.warning(
+            "%s; serving last known data, retrying in %.0f seconds", err, retry_in
+        )
+        self.stale = True
+        self._mark_unchanged()
+        return self.data
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last good deliveries from disk.
+
+        Returns True when a snapshot was found and loaded.
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+
+        restored = {package["tracking_number"] for package in snapshot["deliveries"]}
+        self._completed_since = {
+            tracking_number: dt_util.parse_datetime(since)
+            for tracking_number, since in snapshot.get("completed_since", {}).items()
+            if tracking_number in restored
+        }
+        self.data = self._set_packages(snapshot["deliveries"])
+        self.snapshot_time = dt_util.parse_datetime(snapshot["timestamp"])
+        _LOGGER.debug(
+            "Restored %d packages from snapshot taken at %s",
+            len(self.data),
+            self.snapshot_time,
+        )
+        return True
+
+    @property
+    def snapshot_is_stale(self) -> bool:
+        """Return True if the data is older than the scan interval."""
+        if self.snapshot_time is None:
+            return True
+        return dt_util.utcnow() - self.snapshot_time >= self.scheduler.scan_interval
+
+    @callback
+    def _snapshot(self):
+        """Return the data to persist."""
+        return {
+            "timestamp": self.snapshot_time.isoformat(),
+            "deliveries": [delivery.as_dict() for delivery in self.data],
+            "completed_since": {
+                tracking_number: since.isoformat()
+                for tracking_number, since in self._completed_since.items()
+            },
+        }
+
+    def _set_packages(self, packages, partial=False):
+        """Parse, index and diff the raw packages of a refresh.
+
+        Returns the list of Delivery objects. Packages whose content did not
+        change keep the object from the previous refresh. A partial update
+        only replaces the given packages and keeps all others.
+        """
+        raw = {package.get("tracking_number", ""): package for package in packages}
+        for tracking_number in [tn for tn in raw if tn in self.archive]:
+            if raw[tracking_number].get("status_code") == COMPLETED_STATUS_CODE:
+                del raw[tracking_number]
+            else:
+                # No longer completed, bring it back into the live set
+                self.archive.async_discard(tracking_number)
+        self._diff_packages(
+            {
+                tracking_number: _fingerprint(package)
+                for tracking_number, package in raw.items()
+            },
+            partial,
+        )
+
+        # Build the lookup index once per refresh so sensors don't scan the list
+        previous = self.packages
+        self.packages = dict(previous) if partial else {}
+        parsed_events = 0
+        tz = dt_util.DEFAULT_TIME_ZONE
+        for tracking_number, package in raw.items():
+            if tracking_number not in self.changed_packages:
+                self.packages[tracking_number] = previous[tracking_number]
+                continue
+            delivery = Delivery.from_dict(package, previous.get(tracking_number), tz)
+            self.packages[tracking_number] = delivery
+            parsed_events += len(delivery.events)
+        now = dt_util.utcnow()
+        for tracking_number in self.changed_packages:
+            package = self.packages.get(tracking_number)
+            if package is not None and package.status_code == COMPLETED_STATUS_CODE:
+                self._completed_since.setdefault(tracking_number, now)
+            else:
+                self._completed_since.pop(tracking_number, None)
+
+        self._summary_changed = self.summary.apply(
+            self.packages, self.changed_packages
+        )
+        self.index.apply(self.packages, self.changed_packages)
+        self._archive_completed()
+
+        self.metrics.record_parsed(
+            len(self.changed_packages & raw.keys()), parsed_events
+        )
+        return list(self.packages.values())
+
+    @callback
+    def async_push(self, packages) -> None:
+        """Apply delivery updates pushed to the webhook.
+
+        Pushed packages are merged into the current set; packages missing
+        from the push are kept until the next poll reconciles the full feed.
+        """
+        deliveries = self._set_packages(packages, partial=True)
+        _LOGGER.debug("Pushed package changes: %s", self.change_counts)
+        # The next poll must reconcile the full feed even if the API answers
+        # with the same body as before the push, and must not be served the
+        # hub's result from before the push
+        self._version = None
+        self.hub.invalidate(self.filter_mode)
+        self.history.async_merge(self.packages, self.changed_packages)
+        self.snapshot_time = dt_util.utcnow()
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        # Also pushes back the next safety-net poll
+        self.async_set_updated_data(deliveries)
+
+    def _archive_completed(self) -> bool:
+        """Move packages completed for longer than the TTL to the archive.
+
+        Archived packages leave the live set as if they had left the feed, so
+        their sensors and registry entries are removed. Returns True if any
+        package was archived.
+        """
+        if self.archive_after is None:
+            return False
+
+        now = dt_util.utcnow()
+        expired = [
+            tracking_number
+            for tracking_number, since in self._completed_since.items()
+            if now - since >= self.archive_after
+        ]
+        if not expired:
+            return False
+
+        self.archive.async_add(
+            [self.packages[tracking_number] for tracking_number in expired],
+            self._completed_since,
+            now,
+        )
+        for tracking_number in expired:
+            del self.packages[tracking_number]
+            del self._fingerprints[tracking_number]
+            del self._completed_since[tracking_number]
+
+        self.changed_packages = self.changed_packages | set(expired)
+        self._summary_changed |= self.summary.apply(self.packages, expired)
+        self.index.apply(self.packages, expired)
+        _LOGGER.debug("Archived %d completed packages", len(expired))
+        return True
+
+    def _diff_packages(self, current, partial=False):
+        """Compare the package fingerprints against the previous refresh."""
+        previous = self._fingerprints
+        if partial:
+            current = {**previous, **current}
+
+        added = current.keys() - previous.keys()
+        removed = previous.keys() - current.keys()
+        changed = {
+            tracking_number
+            for tracking_number, fingerprint in current.items()
+            if tracking_number in previous and previous[tracking_number] != fingerprint
+        }
+
+        self._fingerprints = current
+        self.changed_packages = added | changed | removed
+        self.change_counts = {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": len(current) - len(added) - len(changed),
+        }
+        _LOGGER.debug("Package changes in last refresh: %s", self.change_counts)
+
+    def _mark_unchanged(self):
+        """Record that the last refresh did not change any package."""
+        self.changed_packages = set()
+        self._summary_changed = False
+        self.metrics.record_parsed(0, 0)
+        self.change_counts = {
+            "added": 0,
+            "changed": 0,
+            "removed": 0,
+            "unchanged": len(self.packages),
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose package changed.
+
+        Listeners without a context (e.g. platform bookkeeping) are always
+        notified, and the refresh metrics sensors are notified even when the
+        refresh failed. When availability or staleness flips every listener is
+        notified so entities can update their state.
+        """
+        if (
+            self.last_update_success != self._last_notified_success
+            or self.stale != self._last_notified_stale
+        ):
+            self._last_notified_success = self.last_update_success
+            self._last_notified_stale = self.stale
+            self.metrics.record_listeners_notified(len(self._listeners))
+            super().async_update_listeners()
+            return
+
+        notified = 0
+        for update_callback, context in list(self._listeners.values()):
+            if context == METRICS_CONTEXT or (
+                self.last_update_success
+                and (
+                    context is None
+                    or context in self.changed_packages
+                    or (context == SUMMARY_CONTEXT and self._summary_changed)
+                )
+            ):
+                notified += 1
+                update_callback()
+        self.metrics.record_listeners_notified(notified)
+
+
+def _fingerprint(package):
+    """Return a content fingerprint for a package."""
+    return hash(json.dumps(package, sort_keys=True, separators=(",", ":")))
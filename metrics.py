@@ -0,0 +1,92 @@
+"""Refresh path metrics for Parcel Package Tracking."""
+from collections import deque
+
+from .const import METRICS_WINDOW
+
+# Listener context of the diagnostic sensors, which update on every refresh
+METRICS_CONTEXT = "refresh_metrics"
+
+
+def _percentile(values, percent):
+    """Return the nearest-rank percentile of the values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(rank)]
+
+
+class RefreshMetrics:
+    """Per-refresh metrics with rolling windows for the timing values."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        """Initialize the metrics."""
+        self.http_latency = deque(maxlen=window)
+        self.payload_size = deque(maxlen=window)
+        self.decode_time = deque(maxlen=window)
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.packages_parsed = 0
+        self.events_parsed = 0
+        self.listeners_notified = 0
+
+    def record_request(self, latency: float, size: int) -> None:
+        """Record the latency and size of an HTTP response."""
+        self.http_latency.append(latency)
+        self.payload_size.append(size)
+
+    def record_decode(self, duration: float) -> None:
+        """Record the time spent decoding a payload."""
+        self.decode_time.append(duration)
+
+    def record_parsed(self, packages: int, events: int) -> None:
+        """Record how many packages and events were parsed."""
+        self.packages_parsed = packages
+        self.events_parsed = events
+
+    def record_listeners_notified(self, count: int) -> None:
+        """Record how many coordinator listeners were notified.
+
+        Listeners include platform bookkeeping callbacks, so this is an upper
+        bound on the entities that wrote state.
+        """
+        self.listeners_notified = count
+
+    def record_success(self) -> None:
+        """Record a successful refresh."""
+        self.refreshes += 1
+        self.consecutive_failures = 0
+
+    def record_failure(self, kind: str, error) -> None:
+        """Record a failed refresh and what kind of failure it was."""
+        self.refreshes += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = {"kind": kind, "message": str(error)}
+
+    @staticmethod
+    def summary(values) -> dict:
+        """Return the last value and rolling p50/p95 of a window."""
+        return {
+            "last": values[-1] if values else None,
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "samples": len(values),
+        }
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "packages_parsed": self.packages_parsed,
+            "events_parsed": self.events_parsed,
+            "listeners_notified": self.listeners_notified,
+            "http_latency": self.summary(self.http_latency),
+            "payload_size": self.summary(self.payload_size),
+            "decode_time": self.summary(self.decode_time),
+        }
@@ -0,0 +1,224 @@
+"""Typed delivery model for Parcel Package Tracking.
+
+Deliveries are kept as ``__slots__`` objects rather than the decoded JSON
+dicts. Strings that repeat across packages and events (carrier codes,
+locations, event descriptions) are interned, and objects that did not change
+since the previous refresh are reused instead of being allocated again.
+
+Dates are parsed into timezone-aware datetimes when a delivery is built. The
+feed repeats the same date strings across events and refreshes, so parsing
+is memoized per distinct value.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+from sys import intern
+
+# Distinct date values remembered by the parser
+DATE_CACHE_SIZE = 4096
+
+# Formats tried after ISO 8601, for carriers that report dates differently
+_DATE_FORMATS = (
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y",
+    "%B %d, %Y %H:%M",
+    "%B %d, %Y %I:%M %p",
+    "%B %d, %Y",
+)
+
+# Sort key for events without a parseable date, which sort last
+_NO_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _intern(value):
+    """Intern a string value, leaving anything else untouched."""
+    return intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value, tz=timezone.utc):
+    """Parse a date string or epoch timestamp into an aware datetime.
+
+    Naive values are taken to be in tz. Returns None for empty or
+    unrecognized values.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz)
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        for date_format in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed
+
+
+class Event:
+    """A single tracking event of a delivery."""
+
+    __slots__ = ("date", "event", "location", "additional", "time")
+
+    def __init__(self, date, event, location, additional=None, time=None):
+        """Initialize the event."""
+        self.date = date
+        self.event = event
+        self.location = location
+        self.additional = additional
+        self.time = time
+
+    @classmethod
+    def from_dict(cls, data: dict, tz=timezone.utc) -> "Event":
+        """Create an event from its API representation."""
+        return cls(
+            data.get("date"),
+            _intern(data.get("event")),
+            _intern(data.get("location")),
+            _intern(data.get("additional")),
+            parse_date(data.get("date"), tz),
+        )
+
+    @property
+    def key(self) -> tuple:
+        """Return the identity of the event, used for deduplication."""
+        return (self.date, self.event, self.location)
+
+    def as_dict(self) -> dict:
+        """Return the API representation of the event."""
+        data = {"event": self.event, "date": self.date, "location": self.location}
+        if self.additional is not None:
+            data["additional"] = self.additional
+        return data
+
+
+class Delivery:
+    """A tracked delivery and its events, newest event first.
+
+    expected and expected_end are the parsed expected delivery window, from
+    the timestamps when the feed has them and from the date strings otherwise.
+    """
+
+    __slots__ = (
+        "tracking_number",
+        "carrier_code",
+        "description",
+        "status_code",
+        "extra_information",
+        "date_expected",
+        "date_expected_end",
+        "timestamp_expected",
+        "timestamp_expected_end",
+        "events",
+        "expected",
+        "expected_end",
+    )
+
+    def __init__(
+        self,
+        tracking_number,
+        carrier_code,
+        description,
+        status_code,
+        extra_information=None,
+        date_expected=None,
+        date_expected_end=None,
+        timestamp_expected=None,
+        timestamp_expected_end=None,
+        events=(),
+        expected=None,
+        expected_end=None,
+    ):
+        """Initialize the delivery."""
+        self.tracking_number = tracking_number
+        self.carrier_code = carrier_code
+        self.description = description
+        self.status_code = status_code
+        self.extra_information = extra_information
+        self.date_expected = date_expected
+        self.date_expected_end = date_expected_end
+        self.timestamp_expected = timestamp_expected
+        self.timestamp_expected_end = timestamp_expected_end
+        self.events = events
+        self.expected = expected
+        self.expected_end = expected_end
+
+    @classmethod
+    def from_dict(
+        cls, data: dict, previous: "Delivery" = None, tz=timezone.utc
+    ) -> "Delivery":
+        """Create a delivery from its API representation.
+
+        Events that are identical to one of the previous version of the
+        delivery are shared with it instead of being parsed again. Naive
+        dates are taken to be in tz. Events are sorted newest first by their
+        parsed time rather than trusting the feed's order.
+        """
+        known = {}
+        if previous is not None:
+            known = {
+                (event.key, event.additional): event for event in previous.events
+            }
+
+        events = []
+        for raw in data.get("events") or ():
+            event = known.get(
+                (
+                    (raw.get("date"), raw.get("event"), raw.get("location")),
+                    raw.get("additional"),
+                )
+            )
+            events.append(event if event is not None else Event.from_dict(raw, tz))
+        # Stable sort, so events with the same or no time keep the feed's order
+        events.sort(key=lambda event: event.time or _NO_TIME, reverse=True)
+
+        timestamp_expected = data.get("timestamp_expected")
+        timestamp_expected_end = data.get("timestamp_expected_end")
+        return cls(
+            data.get("tracking_number", ""),
+            _intern(data.get("carrier_code", "")),
+            data.get("description", ""),
+            data.get("status_code"),
+            data.get("extra_information"),
+            data.get("date_expected"),
+            data.get("date_expected_end"),
+            timestamp_expected,
+            timestamp_expected_end,
+            tuple(events),
+            parse_date(timestamp_expected, tz)
+            or parse_date(data.get("date_expected"), tz),
+            parse_date(timestamp_expected_end, tz)
+            or parse_date(data.get("date_expected_end"), tz),
+        )
+
+    def as_dict(self) -> dict:
+        """Return the API representation of the delivery."""
+        data = {
+            "tracking_number": self.tracking_number,
+            "carrier_code": self.carrier_code,
+            "description": self.description,
+            "status_code": self.status_code,
+            "events": [event.as_dict() for event in self.events],
+        }
+        for name in (
+            "extra_information",
+            "date_expected",
+            "date_expected_end",
+            "timestamp_expected",
+            "timestamp_expected_end",
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
@@ -0,0 +1,104 @@
+"""Options flow for Parcel Package Tracking."""
+import voluptuous as vol
+
+from homeassistant import config_entries
+
+from .const import (
+    DOMAIN,
+    CONF_API_KEY,
+    CONF_FILTER_MODE,
+    CONF_SCAN_INTERVAL,
+    CONF_EVENT_LIMIT,
+    CONF_SUMMARY_ONLY,
+    CONF_ARCHIVE_DAYS,
+    CONF_PUSH,
+    FILTER_MODES,
+    DEFAULT_FILTER_MODE,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_EVENT_LIMIT,
+    DEFAULT_SUMMARY_ONLY,
+    DEFAULT_ARCHIVE_DAYS,
+    DEFAULT_PUSH,
+)
+
+
+def entry_unique_id(api_key, filter_mode):
+    """Return the unique ID of the entry for an API key and filter mode.
+
+    Only the first 8 characters of the key are used, to avoid exposing it.
+    Entries of one key share a fetch hub, so each filter mode can have one.
+    """
+    return f"{api_key[:8]}_{filter_mode}"
+
+
+class ParcelOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Parcel options."""
+
+    def __init__(self, config_entry):
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+
+        if user_input is not None:
+            unique_id = entry_unique_id(
+                self.config_entry.data[CONF_API_KEY], user_input[CONF_FILTER_MODE]
+            )
+            if any(
+                entry.unique_id == unique_id
+                for entry in self.hass.config_entries.async_entries(DOMAIN)
+                if entry.entry_id != self.config_entry.entry_id
+            ):
+                errors["base"] = "already_configured"
+            else:
+                self.hass.config_entries.async_update_entry(
+                    self.config_entry, unique_id=unique_id
+                )
+                return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            errors=errors,
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_FILTER_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_FILTER_MODE, 
+                            self.config_entry.data.get(CONF_FILTER_MODE, DEFAULT_FILTER_MODE)
+                        ),
+                    ): vol.In(FILTER_MODES),
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_SCAN_INTERVAL, 
+                            self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=15, max=180)),
+                    vol.Optional(
+                        CONF_EVENT_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_EVENT_LIMIT, DEFAULT_EVENT_LIMIT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=50)),
+                    vol.Optional(
+                        CONF_SUMMARY_ONLY,
+                        default=self.config_entry.options.get(
+                            CONF_SUMMARY_ONLY, DEFAULT_SUMMARY_ONLY
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ARCHIVE_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=365)),
+                    vol.Optional(
+                        CONF_PUSH,
+                        default=self.config_entry.options.get(CONF_PUSH, DEFAULT_PUSH),
+                    ): bool,
+                }
+            ),
+        )
@@ -0,0 +1,60 @@
+"""Push ingestion for Parcel Package Tracking."""
+from functools import partial
+import logging
+
+from aiohttp import web
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .decoder import async_decode
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_push(hass: HomeAssistant, entry: ConfigEntry, coordinator) -> None:
+    """Accept delivery updates for an entry on a webhook.
+
+    The body has the shape of the deliveries response; the listed
+    deliveries replace the ones with the same tracking number. Only
+    requests from the local network are accepted, as the webhook id is the
+    only credential.
+    """
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if webhook_id is None:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    async def _async_handle_webhook(hass, webhook_id, request):
+        """Feed a pushed deliveries body into the coordinator."""
+        try:
+            data, _ = await async_decode(hass, await request.read())
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+
+        deliveries = data.get("deliveries") if isinstance(data, dict) else None
+        if not isinstance(deliveries, list) or not all(
+            isinstance(delivery, dict) and delivery.get("tracking_number")
+            for delivery in deliveries
+        ):
+            return web.Response(status=400, text="Expected a deliveries list")
+        if not data.get("success", True):
+            return web.Response(status=400, text="Unsuccessful response")
+
+        coordinator.async_push(deliveries)
+        return web.Response(status=200)
+
+    webhook.async_register(
+        hass, DOMAIN, entry.title, webhook_id, _async_handle_webhook, local_only=True
+    )
+    entry.async_on_unload(partial(webhook.async_unregister, hass, webhook_id))
+    _LOGGER.info(
+        "Accepting pushed Parcel deliveries at %s",
+        webhook.async_generate_path(webhook_id),
+    )
@@ -0,0 +1,110 @@
+"""Rate-limit-aware poll scheduling for Parcel Package Tracking."""
+from collections import deque
+from datetime import timedelta
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    API_RATE_LIMIT,
+    API_RATE_PERIOD,
+    IDLE_SCAN_INTERVAL,
+    IDLE_STATUS_CODES,
+    MANUAL_REFRESH_RESERVE,
+    PUSH_SCAN_INTERVAL,
+    URGENT_SCAN_INTERVAL,
+    URGENT_STATUS_CODES,
+)
+
+
+class PollScheduler:
+    """Track the hourly request budget and choose the next poll interval.
+
+    The budget is a sliding window of the timestamps of the calls made in the
+    last period, so the limit holds for any window and not just per bucket.
+    """
+
+    def __init__(
+        self,
+        scan_interval: timedelta,
+        limit: int = API_RATE_LIMIT,
+        period: int = API_RATE_PERIOD,
+        calls: deque = None,
+    ):
+        """Initialize the scheduler."""
+        self.scan_interval = scan_interval
+        self.limit = limit
+        self.period = period
+        self.mode = "normal"
+        # With push updates polls are only a safety net and never speed up
+        self.push = False
+        self.next_interval = scan_interval
+        self.next_poll = None
+        # Pass a shared deque to share the budget between schedulers
+        self._calls = calls if calls is not None else deque()
+
+    def _expire(self, now: float) -> None:
+        """Forget calls that have left the window."""
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests left in the current window."""
+        self._expire(time.monotonic())
+        return self.limit - len(self._calls)
+
+    def try_acquire(self) -> bool:
+        """Spend one request from the budget if one is available."""
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._calls) >= self.limit:
+            return False
+        self._calls.append(now)
+        return True
+
+    def seconds_until_available(self, tokens: int = 1) -> float:
+        """Return how long until the given number of requests is available."""
+        now = time.monotonic()
+        self._expire(now)
+        missing = len(self._calls) + tokens - self.limit
+        if missing <= 0:
+            return 0.0
+        return self._calls[missing - 1] + self.period - now
+
+    def async_next_interval(self, packages) -> timedelta:
+        """Pick the interval until the next poll based on package states."""
+        statuses = {package.status_code for package in packages}
+
+        if self.push:
+            self.mode = "push"
+            interval = max(self.scan_interval, timedelta(minutes=PUSH_SCAN_INTERVAL))
+        elif statuses & URGENT_STATUS_CODES:
+            self.mode = "urgent"
+            interval = min(self.scan_interval, timedelta(minutes=URGENT_SCAN_INTERVAL))
+        elif not statuses - IDLE_STATUS_CODES:
+            self.mode = "idle"
+            interval = max(self.scan_interval, timedelta(minutes=IDLE_SCAN_INTERVAL))
+        else:
+            self.mode = "normal"
+            interval = self.scan_interval
+
+        # Never let scheduled polls eat into the reserve kept for manual refreshes
+        wait = self.seconds_until_available(MANUAL_REFRESH_RESERVE + 1)
+        interval = max(interval, timedelta(seconds=wait))
+
+        self.next_interval = interval
+        self.next_poll = dt_util.utcnow() + interval
+        return interval
+
+    def as_dict(self) -> dict:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "mode": self.mode,
+            "limit": self.limit,
+            "period": self.period,
+            "remaining": self.remaining,
+            "scan_interval": self.scan_interval.total_seconds(),
+            "next_interval": self.next_interval.total_seconds(),
+            "next_poll": self.next_poll.isoformat() if self.next_poll else None,
+        }
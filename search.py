@@ -0,0 +1,206 @@
+"""Delivery search indexes for Parcel Package Tracking."""
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import timedelta
+import heapq
+import re
+
+_TOKEN = re.compile(r"\w+")
+
+# Sorts after any tracking number, to bisect past all pairs of a datetime
+_LAST = chr(0x10FFFF)
+
+
+def tokenize(text) -> set:
+    """Return the lowercase word tokens of a text."""
+    if not text:
+        return set()
+    return set(_TOKEN.findall(text.lower()))
+
+
+class DeliveryIndex:
+    """Lookup indexes over all packages, maintained from each refresh's diff.
+
+    Packages are indexed by carrier, status, the tokens of their description,
+    tracking number and event locations, and their expected delivery time, so
+    a search intersects a few sets instead of scanning every package. The
+    expected times are kept sorted, so range queries bisect to the first
+    match and visit only the packages in the range.
+    """
+
+    def __init__(self):
+        """Initialize the indexes."""
+        self.by_carrier = {}
+        self.by_status = {}
+        self.tokens = {}
+        # (expected datetime, tracking number), sorted for range queries
+        self.expected = []
+        # Tracking numbers of packages without an expected time
+        self.unscheduled = set()
+        # Longest expected window of the indexed packages, how far back a
+        # window can start and still overlap a range
+        self.longest_window = timedelta(0)
+        # Window length -> number of packages, to find the next longest one
+        # when the longest leaves
+        self._windows = Counter()
+        # tracking number -> (carrier, status, tokens, expected, expected end)
+        self._packages = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed packages."""
+        return len(self._packages)
+
+    def apply(self, packages: dict, tracking_numbers) -> None:
+        """Update the indexes for the given changed packages."""
+        for tracking_number in tracking_numbers:
+            package = packages.get(tracking_number)
+            current = None
+            if package is not None:
+                tokens = tokenize(package.description) | tokenize(tracking_number)
+                for event in package.events:
+                    tokens |= tokenize(event.location)
+                current = (
+                    package.carrier_code,
+                    package.status_code,
+                    frozenset(tokens),
+                    package.expected,
+                    package.expected_end,
+                )
+
+            previous = self._packages.get(tracking_number)
+            if current == previous:
+                continue
+            if previous is not None:
+                self._remove(tracking_number, previous)
+            if current is not None:
+                self._add(tracking_number, current)
+
+    def _add(self, tracking_number, entry):
+        """Index a package."""
+        carrier_code, status_code, tokens, expected, expected_end = entry
+        self._packages[tracking_number] = entry
+        self.by_carrier.setdefault(carrier_code, set()).add(tracking_number)
+        self.by_status.setdefault(status_code, set()).add(tracking_number)
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(tracking_number)
+        if expected is None:
+            self.unscheduled.add(tracking_number)
+        else:
+            insort(self.expected, (expected, tracking_number))
+            if expected_end is not None and expected_end > expected:
+                window = expected_end - expected
+                self._windows[window] += 1
+                self.longest_window = max(self.longest_window, window)
+
+    def _remove(self, tracking_number, entry):
+        """Drop a package from the indexes."""
+        carrier_code, status_code, tokens, expected, expected_end = entry
+        del self._packages[tracking_number]
+        _discard(self.by_carrier, carrier_code, tracking_number)
+        _discard(self.by_status, status_code, tracking_number)
+        for token in tokens:
+            _discard(self.tokens, token, tracking_number)
+        if expected is None:
+            self.unscheduled.discard(tracking_number)
+        else:
+            position = bisect_left(self.expected, (expected, tracking_number))
+            del self.expected[position]
+            if expected_end is not None and expected_end > expected:
+                window = expected_end - expected
+                self._windows[window] -= 1
+                if not self._windows[window]:
+                    del self._windows[window]
+                    if window == self.longest_window:
+                        self.longest_window = max(self._windows, default=timedelta(0))
+
+    def search(
+        self,
+        query: str = None,
+        carrier: str = None,
+        status: int = None,
+        expected_after=None,
+        expected_before=None,
+    ):
+        """Return the tracking numbers matching all of the given criteria.
+
+        Every word of the query has to match a token of the package. The
+        expected range is inclusive at both ends. Returns None when no
+        criteria are given, as every package matches.
+        """
+        candidates = []
+        if query is not None:
+            tokens = tokenize(query)
+            if not tokens:
+                # A query without any words matches nothing, not everything
+                return set()
+            candidates.extend(self.tokens.get(token, set()) for token in tokens)
+        if carrier is not None:
+            candidates.append(self.by_carrier.get(carrier, set()))
+        if status is not None:
+            candidates.append(self.by_status.get(status, set()))
+        if expected_after is not None or expected_before is not None:
+            candidates.append(
+                set(self.expected_between(expected_after, expected_before))
+            )
+
+        if not candidates:
+            return None
+        # Intersect starting from the smallest set
+        candidates.sort(key=len)
+        return set(candidates[0]).intersection(*candidates[1:])
+
+    def first(self, limit: int, matches=None) -> list:
+        """Return up to limit tracking numbers, soonest expected first.
+
+        Packages without an expected time come last. Without matches the
+        sorted index is read from the start instead of visiting every package.
+        """
+        if matches is not None:
+            return heapq.nsmallest(limit, matches, key=self._order)
+        result = [tracking_number for _, tracking_number in self.expected[:limit]]
+        if len(result) < limit:
+            result.extend(heapq.nsmallest(limit - len(result), self.unscheduled))
+        return result
+
+    def _order(self, tracking_number):
+        """Return the sort key of a package, soonest expected first."""
+        expected = self._packages[tracking_number][3]
+        return (expected is None, expected or 0, tracking_number)
+
+    def expected_between(self, start=None, end=None) -> list:
+        """Return the tracking numbers expected from start to end, inclusive.
+
+        The tracking numbers are ordered by expected time.
+        """
+        low = bisect_left(self.expected, (start,)) if start is not None else 0
+        high = (
+            bisect_right(self.expected, (end, _LAST))
+            if end is not None
+            else len(self.expected)
+        )
+        return [tracking_number for _, tracking_number in self.expected[low:high]]
+
+    def overlapping(self, start, end) -> list:
+        """Return the tracking numbers whose expected window overlaps a range.
+
+        A package without an expected end has a window of just its expected
+        time. The range is half-open, and the result is ordered by expected
+        time.
+        """
+        result = []
+        for tracking_number in self.expected_between(start - self.longest_window, end):
+            _, _, _, expected, expected_end = self._packages[tracking_number]
+            if expected == end:
+                continue
+            if max(expected, expected_end or expected) >= start:
+                result.append(tracking_number)
+        return result
+
+
+def _discard(index: dict, key, tracking_number):
+    """Remove a tracking number from an index bucket, dropping empty buckets."""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.discard(tracking_number)
+        if not bucket:
+            del index[key]
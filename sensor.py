@@ -1,15 +1,23 @@
 """Sensor platform for Parcel package tracking."""
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -22,10 +30,16 @@ from .const import (
     ATTR_LATEST_EVENT_LOCATION,
     ATTR_LATEST_EVENT_TIME,
     ATTR_EVENTS,
+    ATTR_EVENT_COUNT,
+    ATTR_STALE,
+    OUT_FOR_DELIVERY_STATUS_CODE,
     STATUS_CODES,
     CARRIER_NAMES,
     STATUS_ICONS,
 )
+from .entity import ParcelEntity
+from .metrics import METRICS_CONTEXT, RefreshMetrics
+from .summary import SUMMARY_CONTEXT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,32 +49,105 @@ async def async_setup_entry(
 ) -> None:
     """Set up Parcel sensors based on a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    summary_only = coordinator.summary_only
     
-    # Wait for first data to be available
-    await coordinator.async_config_entry_first_refresh()
+    # Create a sensor for each package, unless only summaries are wanted
+    entities = {}
+    if not summary_only:
+        for tracking_number, package in coordinator.packages.items():
+            entities[tracking_number] = ParcelSensor(coordinator, entry, package)
     
-    # Create a sensor for each package
-    sensors = []
-    for package in coordinator.data:
-        sensors.append(ParcelSensor(coordinator, package))
+    # Drop registry entries left behind by packages that vanished while HA was
+    # down, or by every package once summary-only mode is turned on. Without
+    # a feed or snapshot to compare against, nothing is known to have vanished.
+    if coordinator.data is not None:
+        registry = er.async_get(hass)
+        unique_ids = {sensor.unique_id for sensor in entities.values()}
+        unique_ids.update(
+            f"parcel_{entry.entry_id}_{description.key}"
+            for description in (*METRIC_SENSORS, *SUMMARY_SENSORS)
+        )
+        for registry_entry in er.async_entries_for_config_entry(
+            registry, entry.entry_id
+        ):
+            if (
+                registry_entry.domain == "sensor"
+                and registry_entry.unique_id not in unique_ids
+            ):
+                registry.async_remove(registry_entry.entity_id)
     
-    async_add_entities(sensors, True)
+    async_add_entities(list(entities.values()))
+    async_add_entities(
+        ParcelMetricSensor(coordinator, entry, description)
+        for description in METRIC_SENSORS
+    )
+    async_add_entities(
+        ParcelSummarySensor(coordinator, entry, description)
+        for description in SUMMARY_SENSORS
+    )
+
+    if summary_only:
+        return
+
+    @callback
+    def _async_reconcile_entities() -> None:
+        """Add sensors for new packages and retire those that left the feed.
+
+        Only the packages the coordinator reports as changed are visited, so
+        the cost is proportional to the delta rather than the account size.
+        """
+        new_sensors = []
+        for tracking_number in coordinator.changed_packages:
+            package = coordinator.packages.get(tracking_number)
+            if package is not None:
+                if tracking_number not in entities:
+                    sensor = ParcelSensor(coordinator, entry, package)
+                    entities[tracking_number] = sensor
+                    new_sensors.append(sensor)
+            elif (sensor := entities.pop(tracking_number, None)) is not None:
+                _async_retire_sensor(hass, sensor)
+
+        if new_sensors:
+            _LOGGER.debug("Adding %d new package sensors", len(new_sensors))
+            async_add_entities(new_sensors)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_reconcile_entities))
+
 
+@callback
+def _async_retire_sensor(hass: HomeAssistant, sensor: "ParcelSensor") -> None:
+    """Remove a sensor whose package is no longer tracked."""
+    _LOGGER.debug("Removing sensor for package %s", sensor.unique_id)
+    if sensor.registry_entry is not None:
+        # Removing the registry entry also removes the entity from HA
+        er.async_get(hass).async_remove(sensor.entity_id)
+    else:
+        hass.async_create_task(sensor.async_remove())
 
-class ParcelSensor(CoordinatorEntity, SensorEntity):
+
+class ParcelSensor(ParcelEntity, SensorEntity):
     """Representation of a Parcel sensor."""
 
-    def __init__(self, coordinator, package_data):
+    # The event list changes with every scan and would bloat the recorder; the
+    # full timeline is available through diagnostics and parcel.get_events
+    _unrecorded_attributes = frozenset({ATTR_EVENTS})
+
+    def __init__(self, coordinator, entry, package_data):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        self._tracking_number = package_data.tracking_number
+        # The tracking number is the listener context, so the coordinator only
+        # notifies this entity when its package changes
+        super().__init__(coordinator, context=self._tracking_number)
         self._package_data = package_data
-        self._tracking_number = package_data.get("tracking_number", "")
-        self._carrier_code = package_data.get("carrier_code", "")
-        self._status_code = package_data.get("status_code", 5)  # Default to "Not Found"
-        self._description = package_data.get("description", "")
+        self._carrier_code = package_data.carrier_code
+        self._status_code = package_data.status_code
+        if self._status_code is None:
+            self._status_code = 5  # Default to "Not Found"
+        self._description = package_data.description
         
-        # Set the unique ID to be the tracking number
-        self._attr_unique_id = f"parcel_{self._tracking_number}"
+        # Scope the tracking number to the entry, as entries of the same
+        # account can track the same package
+        self._attr_unique_id = f"parcel_{entry.entry_id}_{self._tracking_number}"
         
         # Set the entity name based on description and carrier
         carrier_name = CARRIER_NAMES.get(self._carrier_code, self._carrier_code.upper())
@@ -69,17 +156,6 @@ class ParcelSensor(CoordinatorEntity, SensorEntity):
         # Set initial state and attributes
         self._update_state_and_attributes()
 
-    @property
-    def device_info(self):
-        """Return device information for this entity."""
-        return {
-            "identifiers": {(DOMAIN, "parcel_tracker")},
-            "name": "Parcel Package Tracker",
-            "manufacturer": "Parcel",
-            "model": "Package Tracker",
-            "sw_version": "1.0.0",
-        }
-
     @property
     def icon(self) -> str:
         """Return the icon of the sensor."""
@@ -87,18 +163,18 @@ class ParcelSensor(CoordinatorEntity, SensorEntity):
 
     def _update_state_and_attributes(self) -> None:
         """Update state and attributes based on the latest package data."""
-        # Try to find the updated package data in the coordinator
-        for package in self.coordinator.data:
-            if package.get("tracking_number") == self._tracking_number:
-                self._package_data = package
-                self._status_code = package.get("status_code", self._status_code)
-                break
+        # Look up the updated package data in the coordinator's index
+        package = self.coordinator.packages.get(self._tracking_number)
+        if package is not None:
+            self._package_data = package
+            if package.status_code is not None:
+                self._status_code = package.status_code
                 
         # Set the sensor state to the status code text
         self._attr_native_value = STATUS_CODES.get(self._status_code, "Unknown")
         
         # Extract events
-        events = self._package_data.get("events", [])
+        events = self._package_data.events
         
         # Get the latest event if available
         latest_event = None
@@ -106,13 +182,13 @@ class ParcelSensor(CoordinatorEntity, SensorEntity):
         latest_event_time = None
         
         if events:
-            latest = events[0]  # Events are assumed to be in descending order
-            latest_event = latest.get("event", "")
-            latest_event_location = latest.get("location", "")
-            latest_event_time = latest.get("date", "")
+            latest = events[0]  # The model sorts events newest first
+            latest_event = latest.event or ""
+            latest_event_location = latest.location or ""
+            latest_event_time = latest.date or ""
             
         # Get expected delivery date if available
-        expected_date = self._package_data.get("date_expected", "")
+        expected_date = self._package_data.date_expected or ""
         
         # Set attributes
         self._attr_extra_state_attributes = {
@@ -124,10 +200,279 @@ class ParcelSensor(CoordinatorEntity, SensorEntity):
             ATTR_LATEST_EVENT: latest_event,
             ATTR_LATEST_EVENT_LOCATION: latest_event_location,
             ATTR_LATEST_EVENT_TIME: latest_event_time,
-            ATTR_EVENTS: events,
+            ATTR_EVENT_COUNT: len(events),
+            # Set while the last known data is served after failed refreshes
+            ATTR_STALE: self.coordinator.stale,
+            ATTR_EVENTS: [
+                event.as_dict() for event in events[: self.coordinator.event_limit]
+            ],
         }
         
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data for this package from the coordinator."""
+        self._update_state_and_attributes()
+        super()._handle_coordinator_update()
+
     async def async_update(self) -> None:
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+        """Update the sensor from the coordinator's cached data.
+
+        Polling an entity (e.g. homeassistant.update_entity) must not spend
+        API quota; refreshes go through the coordinator instead.
+        """
         self._update_state_and_attributes()
+
+
+def _window_attributes(values, scale=1) -> dict:
+    """Return the rolling p50/p95 of a metrics window as attributes."""
+    summary = RefreshMetrics.summary(values)
+    return {
+        "p50": None if summary["p50"] is None else round(summary["p50"] * scale, 3),
+        "p95": None if summary["p95"] is None else round(summary["p95"] * scale, 3),
+        "samples": summary["samples"],
+    }
+
+
+def _last(values, scale=1):
+    """Return the latest value of a metrics window."""
+    return round(values[-1] * scale, 3) if values else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ParcelSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor computed from the coordinator's metrics or summary."""
+
+    value_fn: Callable[[Any], Any]
+    attributes_fn: Callable[[Any], dict] = lambda coordinator: {}
+    # Recompute at midnight, for values that depend on the current day
+    daily: bool = False
+
+
+METRIC_SENSORS = (
+    ParcelSensorEntityDescription(
+        key="refresh_latency",
+        name="Parcel API latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _last(coordinator.metrics.http_latency, 1000),
+        attributes_fn=lambda coordinator: _window_attributes(
+            coordinator.metrics.http_latency, 1000
+        ),
+    ),
+    ParcelSensorEntityDescription(
+        key="payload_size",
+        name="Parcel payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda coordinator: _last(coordinator.metrics.payload_size),
+        attributes_fn=lambda coordinator: _window_attributes(
+            coordinator.metrics.payload_size
+        ),
+    ),
+    ParcelSensorEntityDescription(
+        key="decode_time",
+        name="Parcel decode time",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _last(coordinator.metrics.decode_time, 1000),
+        attributes_fn=lambda coordinator: {
+            **_window_attributes(coordinator.metrics.decode_time, 1000),
+            "packages_parsed": coordinator.metrics.packages_parsed,
+            "events_parsed": coordinator.metrics.events_parsed,
+            "listeners_notified": coordinator.metrics.listeners_notified,
+        },
+    ),
+    ParcelSensorEntityDescription(
+        key="consecutive_failures",
+        name="Parcel consecutive failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.metrics.consecutive_failures,
+        attributes_fn=lambda coordinator: {
+            "failures": coordinator.metrics.failures,
+            "refreshes": coordinator.metrics.refreshes,
+            "last_error": (coordinator.metrics.last_error or {}).get("kind"),
+        },
+    ),
+    ParcelSensorEntityDescription(
+        key="quota_remaining",
+        name="Parcel API quota remaining",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.scheduler.remaining,
+        attributes_fn=lambda coordinator: {"mode": coordinator.scheduler.mode},
+    ),
+)
+
+
+class ParcelMetricSensor(ParcelEntity, SensorEntity):
+    """Diagnostic sensor exposing a refresh path metric.
+
+    Disabled by default; enable it from the device page when investigating
+    slow or failing refreshes.
+    """
+
+    entity_description: ParcelSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, entry, description):
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=METRICS_CONTEXT)
+        self.entity_description = description
+        self._attr_unique_id = f"parcel_{entry.entry_id}_{description.key}"
+        self._update_from_metrics()
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are most useful while refreshes fail."""
+        return True
+
+    def _update_from_metrics(self) -> None:
+        """Read the latest metrics from the coordinator."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self.coordinator)
+        self._attr_extra_state_attributes = description.attributes_fn(
+            self.coordinator
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle the end of a refresh."""
+        self._update_from_metrics()
+        super()._handle_coordinator_update()
+
+    async def async_update(self) -> None:
+        """Update the sensor without triggering a refresh."""
+        self._update_from_metrics()
+
+
+def _next_expected(coordinator):
+    """Return the time of the next expected delivery.
+
+    Packages expected on an earlier day are overdue and not counted; those
+    expected today are, as a date-only expectation starts at midnight.
+    """
+    next_expected = coordinator.summary.next_expected(dt_util.start_of_local_day())
+    if next_expected is None:
+        return None
+    return next_expected[0]
+
+
+def _out_for_delivery_today(coordinator) -> list:
+    """Return the packages out for delivery that are expected today.
+
+    Only the out-for-delivery set is visited. Packages without an expected
+    date count as today, as their status says they are being delivered.
+    """
+    today = dt_util.now().date()
+    return sorted(
+        tracking_number
+        for tracking_number in coordinator.summary.out_for_delivery
+        if (expected := coordinator.packages[tracking_number].expected) is None
+        or dt_util.as_local(expected).date() == today
+    )
+
+
+def _next_expected_attributes(coordinator) -> dict:
+    """Return which package is expected next."""
+    next_expected = coordinator.summary.next_expected(dt_util.start_of_local_day())
+    package = next_expected and coordinator.packages.get(next_expected[1])
+    if not package:
+        return {}
+    return {
+        ATTR_TRACKING_NUMBER: package.tracking_number,
+        ATTR_DESCRIPTION: package.description,
+        ATTR_CARRIER: CARRIER_NAMES.get(package.carrier_code, package.carrier_code),
+    }
+
+
+SUMMARY_SENSORS = (
+    *(
+        ParcelSensorEntityDescription(
+            key=f"status_{status_code}",
+            name=f"Parcel {status}",
+            icon=STATUS_ICONS.get(status_code),
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="packages",
+            value_fn=lambda coordinator, status_code=status_code: (
+                coordinator.summary.counts[status_code]
+            ),
+        )
+        for status_code, status in STATUS_CODES.items()
+    ),
+    ParcelSensorEntityDescription(
+        key="next_expected",
+        name="Parcel next expected delivery",
+        icon="mdi:calendar-clock",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_next_expected,
+        attributes_fn=_next_expected_attributes,
+        daily=True,
+    ),
+    ParcelSensorEntityDescription(
+        key="out_for_delivery_today",
+        name="Parcel out for delivery today",
+        icon=STATUS_ICONS[OUT_FOR_DELIVERY_STATUS_CODE],
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="packages",
+        value_fn=lambda coordinator: len(_out_for_delivery_today(coordinator)),
+        attributes_fn=lambda coordinator: {
+            "tracking_numbers": _out_for_delivery_today(coordinator)
+        },
+        daily=True,
+    ),
+)
+
+
+class ParcelSummarySensor(ParcelEntity, SensorEntity):
+    """Aggregate sensor over all packages.
+
+    The coordinator only notifies these sensors when the summary changed, so
+    their cost does not grow with the number of packages.
+    """
+
+    entity_description: ParcelSensorEntityDescription
+
+    def __init__(self, coordinator, entry, description):
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=SUMMARY_CONTEXT)
+        self.entity_description = description
+        self._attr_unique_id = f"parcel_{entry.entry_id}_{description.key}"
+        self._update_from_summary()
+
+    async def async_added_to_hass(self) -> None:
+        """Also update at midnight if the value depends on the day."""
+        await super().async_added_to_hass()
+        if self.entity_description.daily:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_midnight, hour=0, minute=0, second=0
+                )
+            )
+
+    @callback
+    def _async_midnight(self, now) -> None:
+        """Recompute the value for the new day."""
+        self._update_from_summary()
+        self.async_write_ha_state()
+
+    def _update_from_summary(self) -> None:
+        """Read the aggregates from the coordinator."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self.coordinator)
+        self._attr_extra_state_attributes = {
+            **description.attributes_fn(self.coordinator),
+            ATTR_STALE: self.coordinator.stale,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle a change of the summary."""
+        self._update_from_summary()
+        super()._handle_coordinator_update()
+
+    async def async_update(self) -> None:
+        """Update the sensor without triggering a refresh."""
+        self._update_from_summary()
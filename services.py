@@ -1,29 +1,201 @@
-refresh:
-  name: Refresh
-  description: "Force a refresh of all Parcel package data."
-
-add_tracking:
-  name: Add Tracking
-  description: "Add a new tracking number to Parcel (Note: This is a placeholder service that won't actually work with the current API)."
-  fields:
-    carrier:
-      name: Carrier
-      description: "The carrier code (usps, fedex, ups, etc.)"
-      required: true
-      example: "usps"
-      selector:
-        text:
-    tracking_number:
-      name: Tracking Number
-      description: "The tracking number for the package"
-      required: true
-      example: "9400123456789012345678"
-      selector:
-        text:
-    description:
-      name: Description
-      description: "A description for this package"
-      required: true
-      example: "Amazon order - headphones"
-      selector:
-        text:
+"""Services for the Parcel Package Tracking integration."""
+import asyncio
+import heapq
+import logging
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CARRIER_NAMES,
+    DOMAIN,
+    REFRESH_PARALLELISM,
+    SEARCH_LIMIT,
+    STATUS_CODES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Service schema for refresh
+REFRESH_SCHEMA = vol.Schema({})
+
+# Service schema for add_tracking
+ADD_TRACKING_SCHEMA = vol.Schema(
+    {
+        vol.Required("carrier"): cv.string,
+        vol.Required("tracking_number"): cv.string,
+        vol.Required("description"): cv.string,
+    }
+)
+
+# Service schema for get_events
+GET_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("tracking_number"): cv.string,
+    }
+)
+
+# Service schema for search
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional("query"): cv.string,
+        vol.Optional("carrier"): cv.string,
+        vol.Optional("status"): vol.All(vol.Coerce(int), vol.In(STATUS_CODES)),
+        vol.Optional("expected_after"): cv.datetime,
+        vol.Optional("expected_before"): cv.datetime,
+        vol.Optional("limit", default=SEARCH_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+
+def _as_aware(value):
+    """Take a naive service datetime to be in the configured time zone."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services for the Parcel integration."""
+
+    async def handle_refresh(call: ServiceCall) -> None:
+        """Handle the refresh service call."""
+        _LOGGER.debug("Handling refresh service call")
+        # Refresh all coordinators concurrently, a few at a time. Requests go
+        # through the coordinators' debouncers so repeated calls coalesce, and
+        # entries sharing an API key are coalesced into one request by their hub
+        semaphore = asyncio.Semaphore(REFRESH_PARALLELISM)
+
+        async def _async_refresh(entry_id, coordinator):
+            async with semaphore:
+                await coordinator.async_request_refresh()
+            _LOGGER.debug("Refreshed coordinator for entry %s", entry_id)
+
+        await asyncio.gather(
+            *(
+                _async_refresh(entry_id, coordinator)
+                for entry_id, coordinator in hass.data[DOMAIN].items()
+            )
+        )
+
+    async def handle_add_tracking(call: ServiceCall) -> None:
+        """Handle the add_tracking service call."""
+        _LOGGER.debug("Handling add_tracking service call")
+        # This is a placeholder - the current API doesn't support adding tracking numbers
+        # We would need a different endpoint or method to implement this
+        _LOGGER.warning(
+            "The add_tracking service is not functional with the current API. "
+            "This is a placeholder for future API capabilities."
+        )
+
+    async def handle_get_events(call: ServiceCall) -> ServiceResponse:
+        """Return the full event timeline of a package.
+
+        Archived packages also return their archived details, as they no
+        longer have a sensor.
+        """
+        tracking_number = call.data["tracking_number"]
+        for coordinator in hass.data[DOMAIN].values():
+            # The local history also covers packages that left the feed
+            if (
+                tracking_number in coordinator.history
+                or tracking_number in coordinator.archive
+            ):
+                return {
+                    "tracking_number": tracking_number,
+                    "archived": coordinator.archive.get(tracking_number),
+                    "events": coordinator.history.events(tracking_number),
+                }
+        raise HomeAssistantError(f"Unknown tracking number: {tracking_number}")
+
+    async def handle_search(call: ServiceCall) -> ServiceResponse:
+        """Return the tracked packages matching the given criteria."""
+        limit = call.data["limit"]
+        count = 0
+        results = []
+        for coordinator in hass.data[DOMAIN].values():
+            # Answered from the coordinator's indexes, not by scanning packages
+            index = coordinator.index
+            matches = index.search(
+                call.data.get("query"),
+                call.data.get("carrier"),
+                call.data.get("status"),
+                _as_aware(call.data.get("expected_after")),
+                _as_aware(call.data.get("expected_before")),
+            )
+            count += len(index) if matches is None else len(matches)
+            results.extend(
+                coordinator.packages[tn] for tn in index.first(limit, matches)
+            )
+
+        # Soonest expected first, packages without an expected date last
+        results = heapq.nsmallest(
+            limit,
+            results,
+            key=lambda package: (
+                package.expected is None,
+                package.expected or 0,
+                package.tracking_number,
+            ),
+        )
+        return {
+            "count": count,
+            "deliveries": [
+                {
+                    "tracking_number": package.tracking_number,
+                    "description": package.description,
+                    "carrier": CARRIER_NAMES.get(
+                        package.carrier_code, package.carrier_code
+                    ),
+                    "status": STATUS_CODES.get(package.status_code, "Unknown"),
+                    "expected": package.expected.isoformat()
+                    if package.expected
+                    else None,
+                }
+                for package in results
+            ],
+        }
+
+    # Register services
+    hass.services.async_register(
+        DOMAIN, "refresh", handle_refresh, schema=REFRESH_SCHEMA
+    )
+    
+    hass.services.async_register(
+        DOMAIN, "add_tracking", handle_add_tracking, schema=ADD_TRACKING_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_events",
+        handle_get_events,
+        schema=GET_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "search",
+        handle_search,
+        schema=SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Unload services for the Parcel integration."""
+    # Remove services
+    hass.services.async_remove(DOMAIN, "refresh")
+    hass.services.async_remove(DOMAIN, "add_tracking")
+    hass.services.async_remove(DOMAIN, "get_events")
+    hass.services.async_remove(DOMAIN, "search")
@@ -0,0 +1,107 @@
+"""Aggregate delivery summary for Parcel Package Tracking."""
+import heapq
+
+from .const import COMPLETED_STATUS_CODE, OUT_FOR_DELIVERY_STATUS_CODE, STATUS_CODES
+
+# Listener context of the summary sensors, notified when an aggregate changes
+SUMMARY_CONTEXT = "summary"
+
+
+class DeliverySummary:
+    """Aggregates over all packages, maintained from each refresh's diff.
+
+    Only the packages that changed are visited, so keeping the counts, the
+    next expected delivery and the out-for-delivery set current costs
+    nothing for the packages that stayed the same.
+    """
+
+    def __init__(self):
+        """Initialize the summary."""
+        self.counts = dict.fromkeys(STATUS_CODES, 0)
+        self.out_for_delivery = set()
+        # tracking number -> (status code, expected datetime) counted above
+        self._packages = {}
+        # (expected datetime, tracking number) of pending packages; entries
+        # that no longer match _packages are dropped lazily when at the top
+        self._expected = []
+
+    def apply(self, packages: dict, tracking_numbers) -> bool:
+        """Update the aggregates for the given changed packages.
+
+        Returns True if any aggregate changed.
+        """
+        changed = False
+        for tracking_number in tracking_numbers:
+            package = packages.get(tracking_number)
+            current = (
+                (package.status_code, package.expected)
+                if package is not None
+                else None
+            )
+            previous = self._packages.get(tracking_number)
+            if current == previous:
+                continue
+
+            changed = True
+            if previous is not None:
+                self._remove(tracking_number, previous[0])
+            if current is not None:
+                self._add(tracking_number, *current, previous)
+
+        if changed and len(self._expected) > 2 * len(self._packages) + 16:
+            self._rebuild_expected()
+        return changed
+
+    def _add(self, tracking_number, status_code, expected, previous):
+        """Count a package."""
+        self._packages[tracking_number] = (status_code, expected)
+        if status_code in self.counts:
+            self.counts[status_code] += 1
+        if status_code == OUT_FOR_DELIVERY_STATUS_CODE:
+            self.out_for_delivery.add(tracking_number)
+        if (
+            expected is not None
+            and status_code != COMPLETED_STATUS_CODE
+            and (
+                previous is None
+                or previous[1] != expected
+                or previous[0] == COMPLETED_STATUS_CODE
+            )
+        ):
+            heapq.heappush(self._expected, (expected, tracking_number))
+
+    def _rebuild_expected(self):
+        """Drop the stale entries piled up in the expected heap."""
+        self._expected = [
+            (expected, tracking_number)
+            for tracking_number, (status_code, expected) in self._packages.items()
+            if expected is not None and status_code != COMPLETED_STATUS_CODE
+        ]
+        heapq.heapify(self._expected)
+
+    def _remove(self, tracking_number, status_code):
+        """Stop counting a package; its expected entry is dropped lazily."""
+        del self._packages[tracking_number]
+        if status_code in self.counts:
+            self.counts[status_code] -= 1
+        self.out_for_delivery.discard(tracking_number)
+
+    def next_expected(self, since):
+        """Return (datetime, tracking number) of the next expected delivery.
+
+        Packages expected before since are overdue and skipped. As time only
+        moves forward, their entries are dropped like stale ones.
+        """
+        heap = self._expected
+        while heap:
+            expected, tracking_number = heap[0]
+            current = self._packages.get(tracking_number)
+            if (
+                expected >= since
+                and current is not None
+                and current[1] == expected
+                and current[0] != COMPLETED_STATUS_CODE
+            ):
+                return heap[0]
+            heapq.heappop(heap)
+        return None